@@ -1,10 +1,15 @@
 from fastapi import APIRouter, HTTPException, Depends, Header
 from pydantic import BaseModel, EmailStr
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.models import User, Session as UserSession
-from app.auth import hash_password, verify_password, generate_session_token, get_session_expiry
+from app.auth import (
+    hash_password_async, verify_and_update_password_async, get_hashing_metrics,
+    generate_session_token, get_session_expiry
+)
 
 router = APIRouter()
 
@@ -46,23 +51,29 @@ def get_current_user(authorization: str = Header(None), db: Session = Depends(ge
 
     return user
 
+# Same as get_current_user, but anonymous requests get None instead of a 401
+def get_optional_user(authorization: str = Header(None), db: Session = Depends(get_db)):
+    if not authorization:
+        return None
+    return get_current_user(authorization, db)
+
 @router.post("/register")
-def register(request: RegisterRequest, db: Session = Depends(get_db)):
+async def register(request: RegisterRequest, db: AsyncSession = Depends(get_async_db)):
     """Register a new user"""
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == request.email).first()
+    existing_user = await db.scalar(select(User).where(User.email == request.email))
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
 
     # Create new user
     user = User(
         email=request.email,
-        hashed_password=hash_password(request.password),
+        hashed_password=await hash_password_async(request.password),
         full_name=request.full_name
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
 
     # Create session
     session_token = generate_session_token()
@@ -72,7 +83,7 @@ def register(request: RegisterRequest, db: Session = Depends(get_db)):
         expires_at=get_session_expiry(30)  # 30 days
     )
     db.add(session)
-    db.commit()
+    await db.commit()
 
     return {
         "success": True,
@@ -88,16 +99,24 @@ def register(request: RegisterRequest, db: Session = Depends(get_db)):
     }
 
 @router.post("/login")
-def login(request: LoginRequest, db: Session = Depends(get_db)):
+async def login(request: LoginRequest, db: AsyncSession = Depends(get_async_db)):
     """Login user and create session"""
     # Find user
-    user = db.query(User).filter(User.email == request.email).first()
-    if not user or not verify_password(request.password, user.hashed_password):
+    user = await db.scalar(select(User).where(User.email == request.email))
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid email or password")
+
+    valid, new_hash = await verify_and_update_password_async(request.password, user.hashed_password)
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
     if not user.is_active:
         raise HTTPException(status_code=401, detail="User account is inactive")
 
+    # Transparently upgrade the hash if the bcrypt cost changed
+    if new_hash:
+        user.hashed_password = new_hash
+
     # Update last login
     user.last_login = datetime.utcnow()
 
@@ -109,7 +128,7 @@ def login(request: LoginRequest, db: Session = Depends(get_db)):
         expires_at=get_session_expiry(30)  # 30 days
     )
     db.add(session)
-    db.commit()
+    await db.commit()
 
     return {
         "success": True,
@@ -175,3 +194,11 @@ def refresh_session(current_user: User = Depends(get_current_user), authorizatio
         "message": "Session refreshed",
         "expires_at": session.expires_at.isoformat()
     }
+
+@router.get("/hashing-metrics")
+def hashing_metrics(current_user: User = Depends(get_current_user)):
+    """Password hashing pool metrics"""
+    return {
+        "success": True,
+        "metrics": get_hashing_metrics()
+    }
@@ -1,20 +1,42 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends, Query
 from pydantic import BaseModel, EmailStr
 from typing import List, Optional
-from datetime import datetime
-from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
 import asyncio
 import random
 
-from app.database import get_db
-from app.models import Campaign as CampaignModel, EmailSent as EmailSentModel, User
+from app.database import get_async_db, AsyncSessionLocal
+from app.models import Campaign as CampaignModel, EmailSent as EmailSentModel, PersonalizedEmail, User
+from app.models.campaign_stats import CampaignStats, CampaignDailyStats, record_send_result
 from app.api.auth_routes import get_current_user
+from app.services.pagination import encode_cursor, decode_cursor, newer_first_after
+from app.services.lead_import import load_list_leads
+from app.services.email_frequency import get_suppressed_emails
+from app.services.send_quota import reserve_send, release_send
+from app.services.personalization import (
+    personalization_jobs, run_personalization_job, get_personalized_variants, clamp_concurrency, dedupe_leads
+)
 
 router = APIRouter()
 
 # In-memory progress tracking (can't be in DB because it's real-time)
 campaign_progress = {}  # Track campaign sending progress
 
+# /emails-sent paging - body is only loaded when asked for in `fields`
+EMAILS_SENT_PAGE_SIZE = 50
+EMAILS_SENT_MAX_PAGE_SIZE = 500
+EMAILS_SENT_FIELDS = (
+    "id", "campaign_id", "lead_id", "recipient_email", "recipient_name", "subject", "body",
+    "status", "sent_at", "error_message", "created_at"
+)
+EMAILS_SENT_DEFAULT_FIELDS = tuple(f for f in EMAILS_SENT_FIELDS if f not in ("body", "recipient_name"))
+
+# Default window for daily / per-sender rollups
+STATS_DEFAULT_DAYS = 30
+STATS_MAX_DAYS = 366
+
 class Campaign(BaseModel):
     name: str
     subject: str
@@ -40,22 +62,38 @@ class LeadEmail(BaseModel):
 
 class StartCampaignRequest(BaseModel):
     campaign_id: int
-    leads: List[LeadEmail]  # List of leads with their emails
+    leads: List[LeadEmail] = []  # List of leads with their emails
+    lead_list_id: Optional[int] = None  # Or an imported lead list (/leads/import)
 
 class StopCampaignRequest(BaseModel):
     campaign_id: int
 
+class PersonalizeLead(BaseModel):
+    id: int
+    email: str
+    name: str
+    business_category: Optional[str] = None
+    website: Optional[str] = None
+    address: Optional[str] = None
+
+class PersonalizeCampaignRequest(BaseModel):
+    leads: List[PersonalizeLead]
+    concurrency: Optional[int] = None  # Parallel model calls (defaults to PERSONALIZATION_CONCURRENCY, capped)
+    instructions: Optional[str] = None  # Extra guidance for the model
+
 @router.get("/campaigns")
 async def get_campaigns(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all campaigns for current user
     """
-    campaigns = db.query(CampaignModel).filter(
-        CampaignModel.user_id == current_user.id
-    ).order_by(CampaignModel.created_at.desc()).all()
+    campaigns = (await db.scalars(
+        select(CampaignModel)
+        .where(CampaignModel.user_id == current_user.id)
+        .order_by(CampaignModel.created_at.desc())
+    )).all()
 
     return {
         "success": True,
@@ -78,7 +116,7 @@ async def get_campaigns(
 async def create_campaign(
     campaign: Campaign,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new email campaign
@@ -94,8 +132,8 @@ async def create_campaign(
     )
 
     db.add(new_campaign)
-    db.commit()
-    db.refresh(new_campaign)
+    await db.commit()
+    await db.refresh(new_campaign)
 
     return {
         "id": new_campaign.id,
@@ -108,10 +146,14 @@ async def create_campaign(
         "created_at": new_campaign.created_at.isoformat()
     }
 
-async def send_campaign_emails_background(campaign_id: int, leads: List[dict], db: Session):
+async def send_campaign_emails_background(campaign_id: int, leads: List[dict]):
     """
     Background task to send campaign emails
     """
+    async with AsyncSessionLocal() as db:
+        await _send_campaign_emails(campaign_id, leads, db)
+
+async def _send_campaign_emails(campaign_id: int, leads: List[dict], db: AsyncSession):
     from app.api.google_oauth_routes import user_credentials
     from google.oauth2.credentials import Credentials
     from googleapiclient.discovery import build
@@ -119,12 +161,15 @@ async def send_campaign_emails_background(campaign_id: int, leads: List[dict], d
     import base64
 
     # Get campaign from database
-    campaign = db.query(CampaignModel).filter(CampaignModel.id == campaign_id).first()
+    campaign = await db.get(CampaignModel, campaign_id)
     if not campaign:
         return
 
     sender_email = campaign.sender_email
 
+    # AI-personalized variants prepared with /campaigns/{id}/personalize
+    personalized = await get_personalized_variants(db, campaign_id)
+
     # Check if sender has OAuth credentials
     if sender_email not in user_credentials:
         campaign_progress[campaign_id] = {
@@ -135,7 +180,7 @@ async def send_campaign_emails_background(campaign_id: int, leads: List[dict], d
             "total": len(leads)
         }
         campaign.status = "failed"
-        db.commit()
+        await db.commit()
         return
 
     # Initialize progress
@@ -161,19 +206,33 @@ async def send_campaign_emails_background(campaign_id: int, leads: List[dict], d
 
     sent_count = 0
     failed_count = 0
+    quota_reached = False
 
     for lead in leads:
+        quota_day = None
+        personalized_subject = campaign.subject
+        personalized_body = campaign.body
         try:
             lead_id = lead["id"]
             to_email = lead["email"]
             lead_name = lead.get("name", "")
 
-            # Personalize message by replacing [Business Name] placeholder
-            personalized_body = campaign.body.replace("[Business Name]", lead_name)
+            # Use the AI variant if one was prepared, otherwise replace the [Business Name] placeholder
+            if lead_id in personalized:
+                personalized_subject, personalized_body = personalized[lead_id]
+            else:
+                personalized_subject = campaign.subject
+                personalized_body = campaign.body.replace("[Business Name]", lead_name)
+
+            # Claim a send from the sender's daily quota (shared with direct sends)
+            quota_day = await reserve_send(db, sender_email)
+            if quota_day is None:
+                quota_reached = True
+                break
 
             message = MIMEText(personalized_body)
             message['to'] = to_email
-            message['subject'] = campaign.subject
+            message['subject'] = personalized_subject
 
             raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
 
@@ -181,6 +240,7 @@ async def send_campaign_emails_background(campaign_id: int, leads: List[dict], d
                 userId='me',
                 body={'raw': raw_message}
             ).execute()
+            quota_day = None  # Went out - it stays counted
 
             sent_count += 1
 
@@ -190,13 +250,14 @@ async def send_campaign_emails_background(campaign_id: int, leads: List[dict], d
                 lead_id=lead_id,
                 recipient_email=to_email,
                 recipient_name=lead_name,
-                subject=campaign.subject,
+                subject=personalized_subject,
                 body=personalized_body,
                 status="sent",
                 sent_at=datetime.utcnow()
             )
             db.add(email_sent)
-            db.commit()
+            await record_send_result(db, campaign_id, sender_email, True)
+            await db.commit()
 
             # Update progress
             campaign_progress[campaign_id]["sent"] = sent_count
@@ -207,6 +268,9 @@ async def send_campaign_emails_background(campaign_id: int, leads: List[dict], d
             await asyncio.sleep(delay)
 
         except Exception as e:
+            if quota_day is not None:
+                # Failed sends don't count against the daily limit
+                await release_send(db, sender_email, quota_day)
             failed_count += 1
             campaign_progress[campaign_id]["failed"] = failed_count
 
@@ -216,85 +280,235 @@ async def send_campaign_emails_background(campaign_id: int, leads: List[dict], d
                 lead_id=lead.get("id", 0),
                 recipient_email=lead.get("email", "unknown"),
                 recipient_name=lead.get("name", ""),
-                subject=campaign.subject,
-                body=campaign.body,
+                subject=personalized_subject,
+                body=personalized_body,
                 status="failed",
                 error_message=str(e)
             )
             db.add(email_sent)
-            db.commit()
+            await record_send_result(db, campaign_id, sender_email, False)
+            await db.commit()
+
+    if quota_reached:
+        # The rest waits for tomorrow's quota
+        campaign_progress[campaign_id]["status"] = "paused"
+        campaign_progress[campaign_id]["message"] = (
+            f"Daily limit reached for {sender_email}: {sent_count} sent, {failed_count} failed"
+        )
+        campaign.status = "paused"
+        await db.commit()
+        return
 
     # Mark campaign as completed
     campaign_progress[campaign_id]["status"] = "completed"
     campaign_progress[campaign_id]["message"] = f"Campaign completed: {sent_count} sent, {failed_count} failed"
     campaign.status = "completed"
-    db.commit()
+    await db.commit()
 
 @router.post("/campaigns/start")
 async def start_campaign(
     request: StartCampaignRequest,
     background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Start a campaign and send emails to selected leads
     """
-    campaign = db.query(CampaignModel).filter(
-        CampaignModel.id == request.campaign_id,
-        CampaignModel.user_id == current_user.id
-    ).first()
+    campaign = await db.scalar(
+        select(CampaignModel).where(
+            CampaignModel.id == request.campaign_id,
+            CampaignModel.user_id == current_user.id
+        )
+    )
 
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
 
-    if not request.leads or len(request.leads) == 0:
-        raise HTTPException(status_code=400, detail="No leads selected")
-
-    campaign.status = "running"
-    db.commit()
-
     # Convert leads to dict format for background task
     leads_dict = [{"id": lead.id, "email": lead.email, "name": lead.name} for lead in request.leads]
+    if request.lead_list_id is not None:
+        list_leads = await load_list_leads(db, current_user.id, request.lead_list_id)
+        if list_leads is None:
+            raise HTTPException(status_code=404, detail="Lead list not found")
+        leads_dict.extend(list_leads)
+
+    # Agency/platform addresses found on many unrelated sites would only burn daily quota
+    suppressed = await get_suppressed_emails(db, [lead["email"] for lead in leads_dict])
+    suppressed_count = sum(1 for lead in leads_dict if (lead["email"] or "").lower() in suppressed)
+    leads_dict = [lead for lead in leads_dict if (lead["email"] or "").lower() not in suppressed]
+
+    if not leads_dict:
+        raise HTTPException(status_code=400, detail="No leads selected")
 
-    # Create a new database session for background task
-    from app.database import SessionLocal
-    bg_db = SessionLocal()
+    campaign.status = "running"
+    await db.commit()
 
-    # Start sending emails in background
-    background_tasks.add_task(send_campaign_emails_background, request.campaign_id, leads_dict, bg_db)
+    # Start sending emails in background (it opens its own database session)
+    background_tasks.add_task(send_campaign_emails_background, request.campaign_id, leads_dict)
 
     return {
         "success": True,
-        "message": f"Campaign started - sending to {len(request.leads)} leads",
+        "message": f"Campaign started - sending to {len(leads_dict)} leads",
         "campaign": {
             "id": campaign.id,
             "name": campaign.name,
             "status": campaign.status,
             "created_at": campaign.created_at.isoformat()
         },
-        "total_leads": len(request.leads)
+        "total_leads": len(leads_dict),
+        "suppressed_shared_emails": suppressed_count
+    }
+
+@router.post("/campaigns/{campaign_id}/personalize")
+async def personalize_campaign(
+    campaign_id: int,
+    request: PersonalizeCampaignRequest,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Generate AI-personalized subject/body variants of a campaign for many leads
+    """
+    campaign = await db.scalar(
+        select(CampaignModel).where(
+            CampaignModel.id == campaign_id,
+            CampaignModel.user_id == current_user.id
+        )
+    )
+
+    if not campaign:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+
+    if not request.leads:
+        raise HTTPException(status_code=400, detail="No leads selected")
+
+    # Duplicate ids would collide on the (campaign_id, lead_id) unique index
+    leads = dedupe_leads([lead.dict() for lead in request.leads])
+
+    job_id = f"personalize_{campaign_id}_{datetime.utcnow().timestamp()}"
+    personalization_jobs[job_id] = {
+        "campaign_id": campaign_id,
+        "status": "queued",
+        "total": len(leads),
+        "completed": 0,
+        "failed": 0,
+        "not_saved": 0,
+        "reused": 0,
+        "deduplicated": 0,
+        "message": "Waiting to start..."
+    }
+
+    background_tasks.add_task(
+        run_personalization_job,
+        job_id,
+        campaign_id,
+        campaign.subject,
+        campaign.body,
+        leads,
+        clamp_concurrency(request.concurrency),
+        request.instructions
+    )
+
+    return {
+        "success": True,
+        "job_id": job_id,
+        "message": f"Personalizing campaign for {len(leads)} leads",
+        "total_leads": len(leads)
+    }
+
+@router.get("/personalization-jobs/{job_id}")
+async def get_personalization_progress(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get progress of a bulk personalization job
+    """
+    job = personalization_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Personalization job not found")
+
+    owned = await db.scalar(
+        select(CampaignModel.id).where(
+            CampaignModel.id == job["campaign_id"],
+            CampaignModel.user_id == current_user.id
+        )
+    )
+    if owned is None:
+        raise HTTPException(status_code=404, detail="Personalization job not found")
+
+    return job
+
+@router.get("/campaigns/{campaign_id}/personalized")
+async def get_personalized_emails(
+    campaign_id: int,
+    limit: int = 100,
+    offset: int = 0,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    List personalized variants prepared for a campaign
+    """
+    campaign = await db.scalar(
+        select(CampaignModel).where(
+            CampaignModel.id == campaign_id,
+            CampaignModel.user_id == current_user.id
+        )
+    )
+
+    if not campaign:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+
+    variants = (await db.scalars(
+        select(PersonalizedEmail)
+        .where(PersonalizedEmail.campaign_id == campaign_id)
+        .order_by(PersonalizedEmail.lead_id)
+        .offset(offset)
+        .limit(min(limit, 500))
+    )).all()
+
+    return {
+        "success": True,
+        "personalized_emails": [
+            {
+                "lead_id": v.lead_id,
+                "recipient_email": v.recipient_email,
+                "recipient_name": v.recipient_name,
+                "subject": v.subject,
+                "body": v.body,
+                "status": v.status,
+                "error_message": v.error_message,
+                "created_at": v.created_at.isoformat()
+            }
+            for v in variants
+        ]
     }
 
 @router.post("/campaigns/stop")
 async def stop_campaign(
     request: StopCampaignRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Stop/pause a campaign
     """
-    campaign = db.query(CampaignModel).filter(
-        CampaignModel.id == request.campaign_id,
-        CampaignModel.user_id == current_user.id
-    ).first()
+    campaign = await db.scalar(
+        select(CampaignModel).where(
+            CampaignModel.id == request.campaign_id,
+            CampaignModel.user_id == current_user.id
+        )
+    )
 
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
 
     campaign.status = "paused"
-    db.commit()
+    await db.commit()
 
     return {
         "success": True,
@@ -308,35 +522,208 @@ async def stop_campaign(
 
 @router.get("/emails-sent")
 async def get_emails_sent(
+    limit: int = Query(EMAILS_SENT_PAGE_SIZE, ge=1, le=EMAILS_SENT_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    status: Optional[str] = None,
+    campaign_id: Optional[int] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Get all sent emails for current user's campaigns
+    Get sent emails for current user's campaigns, newest first
+
+    Pages are keyset-paginated: pass the returned next_cursor to get the next page.
+    `fields` is a comma-separated column list; body is left out unless requested.
     """
-    emails = db.query(EmailSentModel).join(CampaignModel).filter(
-        CampaignModel.user_id == current_user.id
-    ).order_by(EmailSentModel.created_at.desc()).all()
+    if fields:
+        requested = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [f for f in requested if f not in EMAILS_SENT_FIELDS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    else:
+        requested = list(EMAILS_SENT_DEFAULT_FIELDS)
+
+    # id and created_at are always loaded - they make up the cursor
+    loaded = list(dict.fromkeys(["id", "created_at"] + requested))
+    query = (
+        select(*[getattr(EmailSentModel, f) for f in loaded])
+        .join(CampaignModel, CampaignModel.id == EmailSentModel.campaign_id)
+        .where(CampaignModel.user_id == current_user.id)
+    )
+    if campaign_id is not None:
+        query = query.where(EmailSentModel.campaign_id == campaign_id)
+    if status:
+        query = query.where(EmailSentModel.status == status)
+    if cursor:
+        try:
+            position = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.where(newer_first_after(EmailSentModel.created_at, EmailSentModel.id, position))
+
+    # Fetch one extra row to know whether another page exists
+    rows = (await db.execute(
+        query.order_by(EmailSentModel.created_at.desc(), EmailSentModel.id.desc()).limit(limit + 1)
+    )).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    emails = []
+    for row in rows:
+        item = {}
+        for f in requested:
+            value = getattr(row, f)
+            item[f] = value.isoformat() if isinstance(value, datetime) else value
+        emails.append(item)
 
     return {
         "success": True,
-        "emails_sent": [
-            {
-                "id": e.id,
-                "campaign_id": e.campaign_id,
-                "lead_id": e.lead_id,
-                "recipient_email": e.recipient_email,
-                "subject": e.subject,
-                "body": e.body,
-                "status": e.status,
-                "sent_at": e.sent_at.isoformat() if e.sent_at else None,
-                "error_message": e.error_message,
-                "created_at": e.created_at.isoformat()
-            }
-            for e in emails
+        "emails_sent": emails,
+        "next_cursor": encode_cursor(rows[-1].created_at, rows[-1].id) if has_more else None,
+        "has_more": has_more
+    }
+
+def _stats_since(days: int):
+    return datetime.utcnow().date() - timedelta(days=days - 1)
+
+def _rate(sent: int, failed: int) -> float:
+    total = sent + failed
+    return round(sent / total * 100, 1) if total else 0.0
+
+@router.get("/campaign-stats")
+async def get_all_campaign_stats(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Sent/failed totals for every campaign of the current user (one counter row per campaign)
+    """
+    rows = (await db.execute(
+        select(CampaignModel.id, CampaignModel.name, CampaignModel.status,
+               CampaignStats.sent, CampaignStats.failed, CampaignStats.last_sent_at)
+        .outerjoin(CampaignStats, CampaignStats.campaign_id == CampaignModel.id)
+        .where(CampaignModel.user_id == current_user.id)
+        .order_by(CampaignModel.created_at.desc())
+    )).all()
+
+    campaigns = []
+    for row in rows:
+        sent, failed = row.sent or 0, row.failed or 0
+        campaigns.append({
+            "campaign_id": row.id,
+            "name": row.name,
+            "status": row.status,
+            "sent": sent,
+            "failed": failed,
+            "success_rate": _rate(sent, failed),
+            "last_sent_at": row.last_sent_at.isoformat() if row.last_sent_at else None
+        })
+
+    return {
+        "success": True,
+        "campaigns": campaigns,
+        "total_sent": sum(c["sent"] for c in campaigns),
+        "total_failed": sum(c["failed"] for c in campaigns)
+    }
+
+@router.get("/campaigns/{campaign_id}/stats")
+async def get_campaign_stats(
+    campaign_id: int,
+    days: int = Query(STATS_DEFAULT_DAYS, ge=1, le=STATS_MAX_DAYS),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Totals plus per-day and per-sender rollups for one campaign, read from the counter tables
+    """
+    campaign = await db.scalar(
+        select(CampaignModel).where(
+            CampaignModel.id == campaign_id,
+            CampaignModel.user_id == current_user.id
+        )
+    )
+    if not campaign:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+
+    totals = await db.scalar(select(CampaignStats).where(CampaignStats.campaign_id == campaign_id))
+    sent, failed = (totals.sent, totals.failed) if totals else (0, 0)
+
+    window = (
+        CampaignDailyStats.campaign_id == campaign_id,
+        CampaignDailyStats.day >= _stats_since(days)
+    )
+    daily = (await db.execute(
+        select(CampaignDailyStats.day,
+               func.sum(CampaignDailyStats.sent).label("sent"),
+               func.sum(CampaignDailyStats.failed).label("failed"))
+        .where(*window)
+        .group_by(CampaignDailyStats.day)
+        .order_by(CampaignDailyStats.day)
+    )).all()
+    senders = (await db.execute(
+        select(CampaignDailyStats.sender_email,
+               func.sum(CampaignDailyStats.sent).label("sent"),
+               func.sum(CampaignDailyStats.failed).label("failed"))
+        .where(*window)
+        .group_by(CampaignDailyStats.sender_email)
+        .order_by(CampaignDailyStats.sender_email)
+    )).all()
+
+    return {
+        "success": True,
+        "campaign_id": campaign_id,
+        "status": campaign.status,
+        "sent": sent,
+        "failed": failed,
+        "success_rate": _rate(sent, failed),
+        "last_sent_at": totals.last_sent_at.isoformat() if totals and totals.last_sent_at else None,
+        "days": days,
+        "daily": [
+            {"day": row.day.isoformat(), "sent": row.sent, "failed": row.failed}
+            for row in daily
+        ],
+        "senders": [
+            {"sender_email": row.sender_email, "sent": row.sent, "failed": row.failed}
+            for row in senders
         ]
     }
 
+@router.get("/sender-stats")
+async def get_sender_stats(
+    days: int = Query(STATS_DEFAULT_DAYS, ge=1, le=STATS_MAX_DAYS),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Per-sender, per-day rollup across all campaigns of the current user
+    """
+    rows = (await db.execute(
+        select(CampaignDailyStats.sender_email, CampaignDailyStats.day,
+               func.sum(CampaignDailyStats.sent).label("sent"),
+               func.sum(CampaignDailyStats.failed).label("failed"))
+        .join(CampaignModel, CampaignModel.id == CampaignDailyStats.campaign_id)
+        .where(
+            CampaignModel.user_id == current_user.id,
+            CampaignDailyStats.day >= _stats_since(days)
+        )
+        .group_by(CampaignDailyStats.sender_email, CampaignDailyStats.day)
+        .order_by(CampaignDailyStats.sender_email, CampaignDailyStats.day)
+    )).all()
+
+    senders = {}
+    for row in rows:
+        sender = senders.setdefault(row.sender_email, {"sender_email": row.sender_email, "sent": 0, "failed": 0, "daily": []})
+        sender["sent"] += row.sent
+        sender["failed"] += row.failed
+        sender["daily"].append({"day": row.day.isoformat(), "sent": row.sent, "failed": row.failed})
+
+    return {
+        "success": True,
+        "days": days,
+        "senders": list(senders.values())
+    }
+
 @router.get("/campaigns/{campaign_id}/progress")
 async def get_campaign_progress(campaign_id: int):
     """
@@ -1,16 +1,34 @@
 from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, EmailStr
 from typing import List, Optional
 from datetime import datetime
 import asyncio
+import json
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import random
 import httpx
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db, AsyncSessionLocal
 from app.models.campaign import EmailSent
+from app.models.user import Lead, LeadList, SearchHistory
+from app.models.scraped_email import EmailLog, upsert_scraped_emails, scraped_email_rows
+from app.models.campaign_stats import record_send_result
+from app.services.send_quota import (
+    DAILY_EMAIL_LIMIT, reserve_send, release_send, get_quota_usage, set_daily_limit, owns_sender_account
+)
+from app.services.ai_client import (
+    chat_completion, stream_chat_completion, get_client as get_ai_client, AIConfigurationError
+)
+from app.services.ai_stream import SubjectBodyStreamParser, format_sse
+from app.services.ai_cache import ai_result_cache, make_cache_key
+from app.services.lead_import import load_list_leads
+from app.services.email_frequency import get_suppressed_emails, SHARED_EMAIL_DOMAIN_LIMIT
+from app.models.email_frequency import EmailFrequency
+from app.api.auth_routes import get_current_user, get_optional_user
 
 router = APIRouter()
 
@@ -19,9 +37,8 @@ email_progress = {}
 search_progress = {}
 search_leads = {}  # Store leads incrementally by search_id
 
-# Daily email limits tracking {email: {date: count}}
-daily_email_counts = {}
-DAILY_EMAIL_LIMIT = 40  # Max emails per account per day
+# Keep proxies from buffering server-sent events
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
 
 class EmailAccount(BaseModel):
     email: EmailStr
@@ -29,7 +46,8 @@ class EmailAccount(BaseModel):
     name: Optional[str] = None  # Sender name (optional)
 
 class SendEmailsRequest(BaseModel):
-    lead_ids: List[str]  # Changed to List[str] as frontend sends email addresses
+    lead_ids: List[str] = []  # Changed to List[str] as frontend sends email addresses
+    lead_list_id: Optional[int] = None  # Or an imported lead list (/leads/import, needs auth)
     subject: str
     body: str
     email_accounts: List[EmailAccount]
@@ -65,27 +83,19 @@ def get_smtp_config(email: str):
     domain = email.split('@')[1].lower()
     return SMTP_CONFIG.get(domain, {"host": "smtp.gmail.com", "port": 587})
 
-def get_daily_email_count(email: str) -> int:
-    """Get today's email count for an email address"""
-    today = datetime.now().strftime("%Y-%m-%d")
-    if email not in daily_email_counts:
-        daily_email_counts[email] = {}
-
-    # Clean up old dates
-    daily_email_counts[email] = {date: count for date, count in daily_email_counts[email].items() if date == today}
-
-    return daily_email_counts[email].get(today, 0)
-
-def increment_daily_email_count(email: str):
-    """Increment today's email count for an email address"""
-    today = datetime.now().strftime("%Y-%m-%d")
-    if email not in daily_email_counts:
-        daily_email_counts[email] = {}
-    daily_email_counts[email][today] = daily_email_counts[email].get(today, 0) + 1
-
-def get_remaining_daily_emails(email: str) -> int:
-    """Get remaining emails for today"""
-    return max(0, DAILY_EMAIL_LIMIT - get_daily_email_count(email))
+async def reserve_next_account(db: AsyncSession, email_accounts: List["EmailAccount"], account_index: int):
+    """
+    Claim one send from the daily quota, starting with the account at account_index
+    Returns (account_index, account, quota_day) for the account that had capacity, or None if
+    all are exhausted; quota_day goes back to release_send if the send fails
+    """
+    for offset in range(len(email_accounts)):
+        index = account_index + offset
+        account = email_accounts[index % len(email_accounts)]
+        quota_day = await reserve_send(db, account.email)
+        if quota_day is not None:
+            return index, account, quota_day
+    return None
 
 async def send_single_email(
     to_email: str,
@@ -122,9 +132,6 @@ async def send_single_email(
             server.login(from_email, password)
             server.send_message(message)
 
-        # Increment daily count after successful send
-        increment_daily_email_count(from_email)
-
         return {"success": True, "email": to_email}
 
     except smtplib.SMTPAuthenticationError as e:
@@ -144,7 +151,7 @@ async def send_emails_background(
     request_id: str,
     leads: List[dict],
     request: SendEmailsRequest,
-    db
+    db: AsyncSession
 ):
     """Background task to send emails with progress tracking"""
 
@@ -168,24 +175,14 @@ async def send_emails_background(
         if email_progress[request_id]["status"] == "stopped":
             break
 
-        # Get current email account and check daily limit
-        account = request.email_accounts[account_index % len(request.email_accounts)]
-
-        # Check daily limit for current account
-        remaining = get_remaining_daily_emails(account.email)
-        if remaining <= 0:
-            # Try next account
-            account_index += 1
-            if account_index >= len(request.email_accounts):
-                # All accounts exhausted for today
-                email_progress[request_id]["status"] = "paused"
-                email_progress[request_id]["message"] = "Daily limit reached for all accounts"
-                break
-            account = request.email_accounts[account_index % len(request.email_accounts)]
-            remaining = get_remaining_daily_emails(account.email)
-            if remaining <= 0:
-                # This account also exhausted
-                continue
+        # Claim a send from the first account that still has daily quota
+        reserved = await reserve_next_account(db, request.email_accounts, account_index)
+        if reserved is None:
+            # All accounts exhausted for today
+            email_progress[request_id]["status"] = "paused"
+            email_progress[request_id]["message"] = "Daily limit reached for all accounts"
+            break
+        account_index, account, quota_day = reserved
 
         # Send email
         result = await send_single_email(
@@ -195,6 +192,8 @@ async def send_emails_background(
             subject=request.subject,
             body=request.body
         )
+        if not result['success']:
+            await release_send(db, account.email, quota_day)
 
         # Update progress
         if result['success']:
@@ -203,7 +202,6 @@ async def send_emails_background(
             # Log to database
             try:
                 # Save to email_logs table
-                from app.models.scraped_email import EmailLog
                 log = EmailLog(
                     lead_id=lead['id'],
                     email_to=lead['email'],
@@ -215,15 +213,15 @@ async def send_emails_background(
                     sent_at=datetime.utcnow()
                 )
                 db.add(log)
-                db.commit()
+                await db.commit()
             except Exception as e:
+                await db.rollback()
                 print(f"Error logging email: {str(e)}")
         else:
             failed += 1
 
             # Log failure to database
             try:
-                from app.models.scraped_email import EmailLog
                 log = EmailLog(
                     lead_id=lead['id'],
                     email_to=lead['email'],
@@ -235,8 +233,9 @@ async def send_emails_background(
                     error_message=result.get('error', 'Unknown error')
                 )
                 db.add(log)
-                db.commit()
+                await db.commit()
             except Exception as e:
+                await db.rollback()
                 print(f"Error logging failure: {str(e)}")
 
         email_progress[request_id]["sent"] = sent
@@ -249,8 +248,9 @@ async def send_emails_background(
         # Rotate to next account
         account_index += 1
 
-    # Mark as completed
-    email_progress[request_id]["status"] = "completed"
+    # Mark as completed (unless paused on the daily limit)
+    if email_progress[request_id]["status"] == "sending":
+        email_progress[request_id]["status"] = "completed"
 
 async def send_emails_background_smtp(
     request_id: str,
@@ -262,10 +262,7 @@ async def send_emails_background_smtp(
     delay_max: float
 ):
     """Background task to send emails to all leads via SMTP"""
-    from app.database import SessionLocal
-    db = SessionLocal()
-
-    try:
+    async with AsyncSessionLocal() as db:
         account_index = 0
         skipped = 0
 
@@ -275,27 +272,22 @@ async def send_emails_background_smtp(
                 break
 
             # Check if already sent to this email (duplicate check)
-            existing = db.query(EmailSent).filter(EmailSent.recipient_email == to_email).first()
+            existing = await db.scalar(
+                select(EmailSent.id).where(EmailSent.recipient_email == to_email).limit(1)
+            )
             if existing:
                 skipped += 1
                 email_progress[request_id]["skipped"] = skipped
                 continue
 
-            # Get current account
-            account = email_accounts[account_index % len(email_accounts)]
-
-            # Check daily limit
-            if get_remaining_daily_emails(account.email) <= 0:
-                # Try next account
-                account_index += 1
-                if account_index >= len(email_accounts):
-                    # All accounts exhausted for today
-                    email_progress[request_id]["status"] = "completed"
-                    email_progress[request_id]["errors"].append("Daily limit reached for all accounts")
-                    break
-                account = email_accounts[account_index % len(email_accounts)]
-                if get_remaining_daily_emails(account.email) <= 0:
-                    continue
+            # Claim a send from the first account that still has daily quota
+            reserved = await reserve_next_account(db, email_accounts, account_index)
+            if reserved is None:
+                # All accounts exhausted for today
+                email_progress[request_id]["status"] = "completed"
+                email_progress[request_id]["errors"].append("Daily limit reached for all accounts")
+                break
+            account_index, account, quota_day = reserved
 
             # Send email
             result = await send_single_email(
@@ -306,6 +298,9 @@ async def send_emails_background_smtp(
                 body=body,
                 sender_name=account.name
             )
+            if not result["success"]:
+                # Failed sends don't count against the daily limit
+                await release_send(db, account.email, quota_day)
 
             # Save to database immediately after sending
             try:
@@ -321,11 +316,12 @@ async def send_emails_background_smtp(
                     error_message=result.get("error") if not result["success"] else None
                 )
                 db.add(email_sent)
-                db.commit()  # Commit immediately - this also flushes
+                await record_send_result(db, None, account.email, result["success"])
+                await db.commit()  # Commit immediately - this also flushes
                 print(f"✓ Database commit successful: {to_email} - Status: {'sent' if result['success'] else 'failed'}")
             except Exception as e:
                 print(f"✗ Database commit failed for {to_email}: {str(e)}")
-                db.rollback()
+                await db.rollback()
                 import traceback
                 traceback.print_exc()
 
@@ -348,17 +344,13 @@ async def send_emails_background_smtp(
             email_progress[request_id]["status"] = "completed"
 
         print(f"Email sending finished for request {request_id}. Status: {email_progress[request_id]['status']}")
-    finally:
-        try:
-            db.close()
-            print(f"✓ Database session closed cleanly for request {request_id}")
-        except Exception as e:
-            print(f"✗ Error closing database session: {str(e)}")
 
 @router.post("/send-emails")
 async def send_emails(
     request: SendEmailsRequest,
-    background_tasks: BackgroundTasks
+    background_tasks: BackgroundTasks,
+    current_user=Depends(get_optional_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Send emails to leads with progress tracking
@@ -366,7 +358,21 @@ async def send_emails(
     # Generate request ID
     request_id = f"email_{datetime.utcnow().timestamp()}"
 
-    if not request.lead_ids:
+    lead_emails = list(request.lead_ids)
+    if request.lead_list_id is not None:
+        if current_user is None:
+            raise HTTPException(status_code=401, detail="Sign in to send to a lead list")
+        list_leads = await load_list_leads(db, current_user.id, request.lead_list_id)
+        if list_leads is None:
+            raise HTTPException(status_code=404, detail="Lead list not found")
+        lead_emails.extend(lead["email"] for lead in list_leads)
+
+    # Agency/platform addresses found on many unrelated sites would only burn daily quota
+    suppressed = await get_suppressed_emails(db, lead_emails)
+    suppressed_count = sum(1 for email in lead_emails if email.lower() in suppressed)
+    lead_emails = [email for email in lead_emails if email.lower() not in suppressed]
+
+    if not lead_emails:
         raise HTTPException(status_code=400, detail="No lead IDs provided")
 
     if not request.email_accounts:
@@ -374,10 +380,11 @@ async def send_emails(
 
     # Initialize progress tracking
     email_progress[request_id] = {
-        "total": len(request.lead_ids),
+        "total": len(lead_emails),
         "sent": 0,
         "failed": 0,
         "skipped": 0,
+        "suppressed": suppressed_count,
         "status": "sending",
         "errors": []
     }
@@ -386,7 +393,7 @@ async def send_emails(
     background_tasks.add_task(
         send_emails_background_smtp,
         request_id,
-        request.lead_ids,
+        lead_emails,
         request.subject,
         request.body,
         request.email_accounts,
@@ -397,7 +404,7 @@ async def send_emails(
     return {
         "success": True,
         "request_id": request_id,
-        "message": f"Started sending {len(request.lead_ids)} emails"
+        "message": f"Started sending {len(lead_emails)} emails"
     }
 
 @router.get("/email-progress/{request_id}")
@@ -426,29 +433,53 @@ async def stop_emails(request_id: str):
         "progress": email_progress[request_id]
     }
 
+async def _owned_lead_ids(db: AsyncSession, user_id: int, lead_ids) -> set:
+    """The lead ids among lead_ids that belong to the user (through a search or a lead list)"""
+    rows = await db.scalars(
+        select(Lead.id)
+        .outerjoin(SearchHistory, SearchHistory.id == Lead.search_id)
+        .outerjoin(LeadList, LeadList.id == Lead.list_id)
+        .where(
+            Lead.id.in_(lead_ids),
+            or_(SearchHistory.user_id == user_id, LeadList.user_id == user_id)
+        )
+    )
+    return set(rows)
+
 @router.post("/scrape-website")
 async def scrape_website_endpoint(
     lead_id: int,
     website_url: str,
-    business_category: str
+    business_category: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user)
 ):
     """
-    Scrape emails from a website and save to database
+    Scrape emails from one of your leads' websites and save them to the database
     """
     from app.services.email_scraper import EmailScraper
 
+    if lead_id not in await _owned_lead_ids(db, current_user.id, [lead_id]):
+        raise HTTPException(status_code=404, detail="Lead not found")
+
     scraper = EmailScraper()
     scraped_emails = await scraper.scrape_website(website_url, business_category)
 
     if scraped_emails:
-        # TODO: Save to database
-        # Requires database connection and ScrapedEmail model
+        saved = 0
+        try:
+            saved = await upsert_scraped_emails(db, scraped_email_rows(lead_id, scraped_emails))
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            print(f"✗ Failed to save scraped emails for lead {lead_id}: {str(e)}")
+
         return {
             "success": True,
             "lead_id": lead_id,
             "total_emails": len(scraped_emails),
-            "emails": scraped_emails,
-            "warning": "Emails not saved to database - database integration required"
+            "saved": saved,
+            "emails": scraped_emails
         }
 
     return {
@@ -456,6 +487,118 @@ async def scrape_website_endpoint(
         "message": "No emails found on website"
     }
 
+class ScrapeSite(BaseModel):
+    lead_id: int
+    website_url: str
+
+class ScrapeWebsitesRequest(BaseModel):
+    business_category: str
+    sites: List[ScrapeSite] = []
+    lead_list_id: Optional[int] = None  # Or every lead with a website in an imported list (needs auth)
+
+# Scraped emails written per upsert while a batch scrape streams
+SCRAPE_PERSIST_BATCH = 200
+# Most websites one batch scrape may cover
+SCRAPE_MAX_SITES = 500
+
+@router.post("/scrape-websites")
+async def scrape_websites_endpoint(
+    request: ScrapeWebsitesRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Scrape many of your leads' websites in one job and stream one NDJSON line per site as it finishes
+    Found emails are saved in bulk as the job runs; the last line is a summary.
+    """
+    from app.services.email_scraper import EmailScraper
+
+    sites = [(site.lead_id, site.website_url) for site in request.sites if site.website_url]
+    if len(sites) > SCRAPE_MAX_SITES:
+        raise HTTPException(status_code=400, detail=f"Too many websites - at most {SCRAPE_MAX_SITES} per batch")
+    if sites:
+        lead_ids = {lead_id for lead_id, _ in sites}
+        owned_ids = await _owned_lead_ids(db, current_user.id, lead_ids)
+        if owned_ids != lead_ids:
+            raise HTTPException(status_code=404, detail=f"Leads not found: {sorted(lead_ids - owned_ids)[:20]}")
+    if request.lead_list_id is not None:
+        owned = await db.scalar(
+            select(LeadList.id).where(LeadList.id == request.lead_list_id, LeadList.user_id == current_user.id)
+        )
+        if owned is None:
+            raise HTTPException(status_code=404, detail="Lead list not found")
+        rows = await db.execute(
+            select(Lead.id, Lead.website)
+            .where(Lead.list_id == request.lead_list_id, Lead.website.isnot(None), Lead.website != "")
+            .order_by(Lead.id)
+        )
+        sites.extend((row.id, row.website) for row in rows)
+    if not sites:
+        raise HTTPException(status_code=400, detail="No websites to scrape")
+    if len(sites) > SCRAPE_MAX_SITES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many websites ({len(sites)}) - at most {SCRAPE_MAX_SITES} per batch"
+        )
+
+    async def results():
+        scraper = EmailScraper()
+        pending_rows = []
+        summary = {"done": True, "sites": 0, "with_emails": 0, "emails": 0, "saved": 0, "errors": 0}
+
+        async def persist():
+            if not pending_rows:
+                return
+            async with AsyncSessionLocal() as session:
+                try:
+                    summary["saved"] += await upsert_scraped_emails(session, pending_rows)
+                    await session.commit()
+                except Exception as e:
+                    await session.rollback()
+                    print(f"✗ Failed to save {len(pending_rows)} scraped emails: {str(e)}")
+            pending_rows.clear()
+
+        try:
+            async for result in scraper.scrape_many(sites, request.business_category):
+                summary["sites"] += 1
+                summary["emails"] += len(result["emails"])
+                summary["with_emails"] += 1 if result["emails"] else 0
+                summary["errors"] += 1 if result["error"] else 0
+                pending_rows.extend(scraped_email_rows(result["lead_id"], result["emails"]))
+                if len(pending_rows) >= SCRAPE_PERSIST_BATCH:
+                    await persist()
+                yield json.dumps(result) + "\n"
+        finally:
+            await persist()
+        yield json.dumps(summary) + "\n"
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+@router.get("/shared-emails")
+async def get_shared_emails_endpoint(
+    min_domains: int = SHARED_EMAIL_DOMAIN_LIMIT + 1,
+    limit: int = 100,
+    current_user=Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Emails seen on the most unrelated websites (web agencies, platforms, template addresses)
+    """
+    rows = await db.execute(
+        select(EmailFrequency.email, EmailFrequency.domain_count, EmailFrequency.updated_at)
+        .where(EmailFrequency.domain_count >= min_domains)
+        .order_by(EmailFrequency.domain_count.desc())
+        .limit(min(limit, 1000))
+    )
+    return {
+        "success": True,
+        "shared_threshold": SHARED_EMAIL_DOMAIN_LIMIT,
+        "emails": [
+            {"email": row.email, "domain_count": row.domain_count, "updated_at": row.updated_at.isoformat()}
+            for row in rows
+        ]
+    }
+
 @router.get("/search-progress/{search_id}")
 async def get_search_progress(search_id: str):
     """
@@ -753,8 +896,11 @@ async def search_businesses(request: SearchRequest):
                             )
                             if scraped_emails:
                                 lead["scrapedEmails"] = scraped_emails
-                                # Set primary email as the first scraped email
-                                lead["email"] = scraped_emails[0]["email"]
+                                # Set primary email as the first scraped email that isn't a shared
+                                # agency/platform address
+                                primary = next((e for e in scraped_emails if not e.get("shared")), None)
+                                if primary:
+                                    lead["email"] = primary["email"]
                         except asyncio.TimeoutError:
                             print(f"[Non-fatal] Timeout scraping {website} after 15s - skipping email scraping for this business")
                             # Continue processing without emails
@@ -988,37 +1134,17 @@ class AIImproveRequest(BaseModel):
     text: str
     subject: Optional[str] = None  # If provided, improve both subject and body
     sender_email: Optional[str] = None
+    use_cache: bool = True  # Set to False to always ask the model again
 
-@router.post("/ai-improve")
-async def ai_improve_text(request: AIImproveRequest):
+def build_improve_prompts(request: AIImproveRequest):
     """
-    Improve email text using OpenAI GPT API
-    Can improve just body, or both subject and body
+    Build (system_prompt, user_prompt, max_tokens) for email improvement
     """
-    try:
-        if not request.text or len(request.text.strip()) == 0:
-            raise HTTPException(status_code=400, detail="Text cannot be empty")
-
-        import os
-        from openai import OpenAI
-
-        # Get OpenAI API key from environment
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise HTTPException(
-                status_code=500,
-                detail="OpenAI API key not configured. Please set OPENAI_API_KEY environment variable."
-            )
-
-        # Initialize OpenAI client
-        client = OpenAI(api_key=api_key)
-
-        # Create prompt for email improvement
-        sender_info = f"\n\nIMPORTANT: Add this sender contact information at the END of the email:\n{request.sender_email}" if request.sender_email else ""
+    sender_info = f"\n\nIMPORTANT: Add this sender contact information at the END of the email:\n{request.sender_email}" if request.sender_email else ""
 
-        if request.subject:
-            # Improve both subject and body
-            system_prompt = """You are a professional email writing assistant. Your task is to improve the given email subject and body to make them more professional, clear, and effective for business communication.
+    if request.subject:
+        # Improve both subject and body
+        system_prompt = """You are a professional email writing assistant. Your task is to improve the given email subject and body to make them more professional, clear, and effective for business communication.
 
 IMPORTANT: You MUST respond in the SAME LANGUAGE as the input text. If the user writes in Turkish, respond in Turkish. If in English, respond in English. If in any other language, respond in that language.
 
@@ -1035,42 +1161,11 @@ BODY: [improved body here]
 
 Do not add any other explanations or meta-commentary. Always maintain the original language."""
 
-            user_prompt = f"Please improve this email subject and body and respond in the same language as the input:\n\nCurrent Subject: {request.subject}\n\nCurrent Body:\n{request.text}{sender_info}"
-
-            # Call OpenAI API
-            response = client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.7,
-                max_tokens=1500
-            )
-
-            improved_content = response.choices[0].message.content.strip()
+        user_prompt = f"Please improve this email subject and body and respond in the same language as the input:\n\nCurrent Subject: {request.subject}\n\nCurrent Body:\n{request.text}{sender_info}"
+        return system_prompt, user_prompt, 1500
 
-            # Parse the response
-            improved_subject = ""
-            improved_body = ""
-
-            if "SUBJECT:" in improved_content and "BODY:" in improved_content:
-                parts = improved_content.split("BODY:")
-                improved_subject = parts[0].replace("SUBJECT:", "").strip()
-                improved_body = parts[1].strip()
-            else:
-                improved_body = improved_content
-
-            return {
-                "success": True,
-                "improved_subject": improved_subject,
-                "improved_text": improved_body,
-                "original_length": len(request.text),
-                "improved_length": len(improved_body)
-            }
-        else:
-            # Improve only body
-            system_prompt = """You are a professional email writing assistant. Your task is to improve the given email text to make it more professional, clear, and effective for business communication.
+    # Improve only body
+    system_prompt = """You are a professional email writing assistant. Your task is to improve the given email text to make it more professional, clear, and effective for business communication.
 
 IMPORTANT: You MUST respond in the SAME LANGUAGE as the input text. If the user writes in Turkish, respond in Turkish. If in English, respond in English. If in any other language, respond in that language.
 
@@ -1083,54 +1178,144 @@ Keep the core message but enhance:
 
 Return ONLY the improved email text without any explanations or meta-commentary. Always maintain the original language."""
 
-            user_prompt = f"Please improve this email and respond in the same language as the input:\n\n{request.text}{sender_info}"
-
-            # Call OpenAI API
-            response = client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.7,
-                max_tokens=1000
-            )
+    user_prompt = f"Please improve this email and respond in the same language as the input:\n\n{request.text}{sender_info}"
+    return system_prompt, user_prompt, 1000
 
-            improved_text = response.choices[0].message.content.strip()
+def build_improve_result(request: AIImproveRequest, content: str) -> dict:
+    """
+    Parse the model output into the /ai-improve response
+    """
+    if request.subject:
+        improved_subject = ""
+        improved_body = ""
+
+        if "SUBJECT:" in content and "BODY:" in content:
+            parts = content.split("BODY:")
+            improved_subject = parts[0].replace("SUBJECT:", "").strip()
+            improved_body = parts[1].strip()
+        else:
+            improved_body = content
 
-            return {
-                "success": True,
-                "improved_text": improved_text,
-                "original_length": len(request.text),
-                "improved_length": len(improved_text)
-            }
+        return {
+            "success": True,
+            "improved_subject": improved_subject,
+            "improved_text": improved_body,
+            "original_length": len(request.text),
+            "improved_length": len(improved_body)
+        }
+
+    return {
+        "success": True,
+        "improved_text": content,
+        "original_length": len(request.text),
+        "improved_length": len(content)
+    }
+
+def improve_cache_key(request: AIImproveRequest) -> str:
+    # Identical inputs return the previously improved text (case matters here)
+    return make_cache_key("improve", [request.text, request.subject, request.sender_email], casefold=False)
+
+@router.post("/ai-improve")
+async def ai_improve_text(request: AIImproveRequest):
+    """
+    Improve email text using OpenAI GPT API
+    Can improve just body, or both subject and body
+    """
+    try:
+        if not request.text or len(request.text.strip()) == 0:
+            raise HTTPException(status_code=400, detail="Text cannot be empty")
+
+        cache_key = improve_cache_key(request)
+        if request.use_cache:
+            cached = await ai_result_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        system_prompt, user_prompt, max_tokens = build_improve_prompts(request)
+
+        # Call OpenAI API
+        improved_content = await chat_completion(system_prompt, user_prompt, max_tokens=max_tokens)
+        result = build_improve_result(request, improved_content)
+
+        if request.use_cache:
+            await ai_result_cache.set(cache_key, "improve", result)
+
+        return result
 
     except HTTPException:
         raise
+    except AIConfigurationError as e:
+        raise HTTPException(status_code=500, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Failed to improve text: {str(e)}"
         )
 
+@router.post("/ai-improve/stream")
+async def ai_improve_text_stream(request: AIImproveRequest):
+    """
+    Streaming variant of /ai-improve - sends subject/body tokens as server-sent events
+    Events: "subject" and "body" carry {"delta": ...}, "done" carries the /ai-improve response
+    """
+    if not request.text or len(request.text.strip()) == 0:
+        raise HTTPException(status_code=400, detail="Text cannot be empty")
+
+    try:
+        get_ai_client()
+    except AIConfigurationError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    cache_key = improve_cache_key(request)
+    cached = await ai_result_cache.get(cache_key) if request.use_cache else None
+    system_prompt, user_prompt, max_tokens = build_improve_prompts(request)
+
+    async def event_stream():
+        if cached is not None:
+            yield format_sse("done", cached)
+            return
+
+        parser = SubjectBodyStreamParser(expect_subject=bool(request.subject))
+        try:
+            async for delta in stream_chat_completion(system_prompt, user_prompt, max_tokens=max_tokens):
+                for section, text in parser.feed(delta):
+                    yield format_sse(section, {"delta": text})
+            for section, text in parser.finish():
+                yield format_sse(section, {"delta": text})
+
+            result = build_improve_result(request, parser.raw.strip())
+            if request.use_cache:
+                await ai_result_cache.set(cache_key, "improve", result)
+            yield format_sse("done", result)
+        except Exception as e:
+            yield format_sse("error", {"detail": f"Failed to improve text: {str(e)}"})
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
 class EmailLimitRequest(BaseModel):
     email_addresses: List[str]
 
+class EmailLimitOverrideRequest(BaseModel):
+    email_address: str
+    daily_limit: Optional[int] = None  # None restores the default limit
+
 @router.post("/email-limits")
-async def get_email_limits(request: EmailLimitRequest):
+async def get_email_limits(request: EmailLimitRequest, db: AsyncSession = Depends(get_async_db)):
     """
-    Get daily email limits and usage for email addresses
+    Get daily email limits and usage for email addresses (from the persistent quota ledger)
     """
+    usage = await get_quota_usage(db, request.email_addresses)
+
     limits = []
     for email in request.email_addresses:
-        sent_today = get_daily_email_count(email)
-        remaining = get_remaining_daily_emails(email)
+        quota = usage[email.strip().lower()]
         limits.append({
             "email": email,
-            "daily_limit": DAILY_EMAIL_LIMIT,
-            "sent_today": sent_today,
-            "remaining": remaining,
-            "percentage_used": round((sent_today / DAILY_EMAIL_LIMIT) * 100, 1)
+            "daily_limit": quota["daily_limit"],
+            "sent_today": quota["sent_today"],
+            "remaining": quota["remaining"],
+            "percentage_used": round((quota["sent_today"] / quota["daily_limit"]) * 100, 1) if quota["daily_limit"] else 100.0,
+            "overridden": quota["overridden"]
         })
 
     total_remaining = sum(limit["remaining"] for limit in limits)
@@ -1138,14 +1323,40 @@ async def get_email_limits(request: EmailLimitRequest):
     return {
         "success": True,
         "limits": limits,
-        "total_daily_capacity": DAILY_EMAIL_LIMIT * len(request.email_addresses),
+        "total_daily_capacity": sum(limit["daily_limit"] for limit in limits),
         "total_sent_today": sum(limit["sent_today"] for limit in limits),
         "total_remaining": total_remaining
     }
 
+@router.put("/email-limits")
+async def set_email_limit(
+    request: EmailLimitOverrideRequest,
+    current_user=Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Override the daily limit for one of your sending accounts (daily_limit=null restores the default)
+    """
+    if request.daily_limit is not None and request.daily_limit < 0:
+        raise HTTPException(status_code=400, detail="daily_limit must be 0 or greater")
+
+    if not await owns_sender_account(db, current_user, request.email_address):
+        raise HTTPException(status_code=403, detail="Not one of your sending accounts")
+
+    await set_daily_limit(db, request.email_address, request.daily_limit)
+    usage = await get_quota_usage(db, [request.email_address])
+
+    return {
+        "success": True,
+        "email": request.email_address,
+        "default_limit": DAILY_EMAIL_LIMIT,
+        **usage[request.email_address.strip().lower()]
+    }
+
 class AISmartSearchRequest(BaseModel):
     user_profile: str
     user_goal: str
+    use_cache: bool = True  # Set to False to always ask the model again
 
 @router.post("/ai-smart-search")
 async def ai_smart_search(request: AISmartSearchRequest):
@@ -1153,17 +1364,15 @@ async def ai_smart_search(request: AISmartSearchRequest):
     Use AI to generate smart search parameters based on user profile and goals
     """
     try:
-        import os
-        from openai import OpenAI
-
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise HTTPException(
-                status_code=500,
-                detail="OpenAI API key not configured"
-            )
-
-        client = OpenAI(api_key=api_key)
+        # Most users ask the same handful of things - serve repeats from the cache
+        cache_key = make_cache_key("smart_search", [request.user_profile, request.user_goal])
+        if request.use_cache:
+            cached = await ai_result_cache.get(cache_key)
+            if cached is not None:
+                return {
+                    "success": True,
+                    "business_type": cached["business_type"]
+                }
 
         system_prompt = """You are an AI assistant helping users find the right business leads. Based on the user's profile and what they're looking for, suggest the best business type to search for.
 
@@ -1186,22 +1395,15 @@ Response: {"business_type": "cafes and restaurants"}"""
 
         user_prompt = f"User Profile: {request.user_profile}\n\nWhat they're looking for: {request.user_goal}\n\nGenerate the best search parameters:"
 
-        response = client.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.7,
-            max_tokens=200
-        )
-
-        result_text = response.choices[0].message.content.strip()
+        result_text = await chat_completion(system_prompt, user_prompt, max_tokens=200)
 
         # Parse JSON response
         import json
         try:
             result = json.loads(result_text)
+            # Only cache real answers, never the fallback
+            if request.use_cache and result.get("business_type"):
+                await ai_result_cache.set(cache_key, "smart_search", {"business_type": result["business_type"]})
         except:
             # Fallback if JSON parsing fails
             result = {
@@ -1213,41 +1415,39 @@ Response: {"business_type": "cafes and restaurants"}"""
             "business_type": result.get("business_type", "businesses")
         }
 
+    except AIConfigurationError as e:
+        raise HTTPException(status_code=500, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"AI Smart Search failed: {str(e)}"
         )
 
+@router.get("/ai-cache/stats")
+async def get_ai_cache_stats(current_user=Depends(get_current_user)):
+    """
+    Hit/miss counters for the AI result cache
+    """
+    return {
+        "success": True,
+        "stats": ai_result_cache.get_stats()
+    }
+
 class AIGenerateEmailRequest(BaseModel):
     request: str  # User's description of what email they want
     user_profile: Optional[str] = None  # Optional user profile for context
     sender_name: Optional[str] = None  # Sender's name to use in email
 
-@router.post("/ai-generate-email")
-async def ai_generate_email(request: AIGenerateEmailRequest):
+def build_generate_email_prompts(request: AIGenerateEmailRequest):
     """
-    Generate a professional email based on user's request
+    Build (system_prompt, user_prompt) for email generation
     """
-    try:
-        import os
-        from openai import OpenAI
-
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise HTTPException(
-                status_code=500,
-                detail="OpenAI API key not configured"
-            )
-
-        client = OpenAI(api_key=api_key)
+    # Build sender name context
+    sender_context = ""
+    if request.sender_name:
+        sender_context = f"\n\n🎯 IMPORTANT: The sender's name is '{request.sender_name}'. Use this actual name in the email instead of placeholders like [Your Name]. Write 'My name is {request.sender_name}' if introducing yourself."
 
-        # Build sender name context
-        sender_context = ""
-        if request.sender_name:
-            sender_context = f"\n\n🎯 IMPORTANT: The sender's name is '{request.sender_name}'. Use this actual name in the email instead of placeholders like [Your Name]. Write 'My name is {request.sender_name}' if introducing yourself."
-
-        system_prompt = f"""You are a professional email writing assistant. Based on the user's request, generate a professional, persuasive business email.
+    system_prompt = f"""You are a professional email writing assistant. Based on the user's request, generate a professional, persuasive business email.
 
 🌍 IMPORTANT: Generate the email in the SAME LANGUAGE as the user's request.
 - If the user writes in Turkish, generate the email in Turkish
@@ -1269,36 +1469,40 @@ BODY: [email body in the same language as user's request]
 
 Do not add any explanations or meta-commentary."""
 
-        user_prompt = f"Generate a professional email based on this request:\n\n{request.request}"
+    user_prompt = f"Generate a professional email based on this request:\n\n{request.request}"
 
-        if request.user_profile:
-            user_prompt += f"\n\nUser Profile (for context): {request.user_profile}"
+    if request.user_profile:
+        user_prompt += f"\n\nUser Profile (for context): {request.user_profile}"
 
-        response = client.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.7,
-            max_tokens=1000
-        )
+    return system_prompt, user_prompt
 
-        generated_content = response.choices[0].message.content.strip()
+def parse_generated_email(generated_content: str):
+    """
+    Split generated content into (subject, body)
+    """
+    if "SUBJECT:" in generated_content and "BODY:" in generated_content:
+        parts = generated_content.split("BODY:")
+        subject = parts[0].replace("SUBJECT:", "").strip()
+        body = parts[1].strip()
+    else:
+        # Fallback if format is wrong
+        lines = generated_content.split('\n')
+        subject = lines[0] if lines else "Business Proposal"
+        body = '\n'.join(lines[1:]) if len(lines) > 1 else generated_content
+    return subject, body
 
-        # Parse the response
-        subject = ""
-        body = ""
+@router.post("/ai-generate-email")
+async def ai_generate_email(request: AIGenerateEmailRequest):
+    """
+    Generate a professional email based on user's request
+    """
+    try:
+        system_prompt, user_prompt = build_generate_email_prompts(request)
 
-        if "SUBJECT:" in generated_content and "BODY:" in generated_content:
-            parts = generated_content.split("BODY:")
-            subject = parts[0].replace("SUBJECT:", "").strip()
-            body = parts[1].strip()
-        else:
-            # Fallback if format is wrong
-            lines = generated_content.split('\n')
-            subject = lines[0] if lines else "Business Proposal"
-            body = '\n'.join(lines[1:]) if len(lines) > 1 else generated_content
+        generated_content = await chat_completion(system_prompt, user_prompt, max_tokens=1000)
+
+        # Parse the response
+        subject, body = parse_generated_email(generated_content)
 
         return {
             "success": True,
@@ -1306,8 +1510,39 @@ Do not add any explanations or meta-commentary."""
             "body": body
         }
 
+    except AIConfigurationError as e:
+        raise HTTPException(status_code=500, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"AI Email Generation failed: {str(e)}"
         )
+
+@router.post("/ai-generate-email/stream")
+async def ai_generate_email_stream(request: AIGenerateEmailRequest):
+    """
+    Streaming variant of /ai-generate-email - sends subject/body tokens as server-sent events
+    Events: "subject" and "body" carry {"delta": ...}, "done" carries the final subject and body
+    """
+    try:
+        get_ai_client()
+    except AIConfigurationError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    system_prompt, user_prompt = build_generate_email_prompts(request)
+
+    async def event_stream():
+        parser = SubjectBodyStreamParser(first_line_subject=True)
+        try:
+            async for delta in stream_chat_completion(system_prompt, user_prompt, max_tokens=1000):
+                for section, text in parser.feed(delta):
+                    yield format_sse(section, {"delta": text})
+            for section, text in parser.finish():
+                yield format_sse(section, {"delta": text})
+
+            subject, body = parse_generated_email(parser.raw.strip())
+            yield format_sse("done", {"success": True, "subject": subject, "body": body})
+        except Exception as e:
+            yield format_sse("error", {"detail": f"AI Email Generation failed: {str(e)}"})
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
@@ -0,0 +1,132 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from sqlalchemy import select, or_
+
+from app.models import Campaign, EmailSent, Lead, LeadList, SearchHistory, ScrapedEmail, User
+from app.api.auth_routes import get_current_user
+from app.services.export import EXPORT_FORMATS, encode_rows, csv_header, stream_query, export_filename
+
+router = APIRouter()
+
+LEAD_COLUMNS = [
+    "id", "list_id", "name", "email", "phone", "website", "address",
+    "google_maps_url", "business_category", "status", "created_at"
+]
+SCRAPED_EMAIL_COLUMNS = ["id", "lead_id", "email", "source", "category", "verified", "scraped_at"]
+EMAIL_SENT_COLUMNS = [
+    "id", "campaign_id", "lead_id", "recipient_email", "recipient_name", "subject",
+    "status", "sent_at", "error_message", "created_at"
+]
+
+# Keys of the in-memory leads built by /search
+SEARCH_LEAD_COLUMNS = [
+    ("id", "id"), ("name", "name"), ("email", "email"), ("phone", "phone"), ("website", "website"),
+    ("address", "address"), ("google_maps_url", "googleMapsUrl"),
+    ("business_category", "businessCategory"), ("status", "status")
+]
+
+def _check_format(fmt: str):
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format. Use one of: {', '.join(EXPORT_FORMATS)}")
+
+def _export_response(body, name: str, fmt: str) -> StreamingResponse:
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{export_filename(name, fmt)}"'}
+    )
+
+@router.get("/export/leads")
+async def export_leads(
+    format: str = Query("csv"),
+    list_id: Optional[int] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Stream all saved and imported leads of the current user as CSV or NDJSON
+    """
+    _check_format(format)
+    query = (
+        select(*[getattr(Lead, c) for c in LEAD_COLUMNS])
+        .outerjoin(SearchHistory, SearchHistory.id == Lead.search_id)
+        .outerjoin(LeadList, LeadList.id == Lead.list_id)
+        .where(or_(SearchHistory.user_id == current_user.id, LeadList.user_id == current_user.id))
+    )
+    if list_id is not None:
+        query = query.where(Lead.list_id == list_id)
+    query = query.order_by(Lead.id)
+    return _export_response(stream_query(query, LEAD_COLUMNS, format), "leads", format)
+
+@router.get("/export/scraped-emails")
+async def export_scraped_emails(
+    format: str = Query("csv"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Stream scraped emails for the current user's leads as CSV or NDJSON
+    """
+    _check_format(format)
+    query = (
+        select(*[getattr(ScrapedEmail, c) for c in SCRAPED_EMAIL_COLUMNS])
+        .join(Lead, Lead.id == ScrapedEmail.lead_id)
+        .join(SearchHistory, SearchHistory.id == Lead.search_id)
+        .where(SearchHistory.user_id == current_user.id)
+        .order_by(ScrapedEmail.id)
+    )
+    return _export_response(stream_query(query, SCRAPED_EMAIL_COLUMNS, format), "scraped-emails", format)
+
+@router.get("/export/emails-sent")
+async def export_emails_sent(
+    format: str = Query("csv"),
+    campaign_id: Optional[int] = None,
+    status: Optional[str] = None,
+    include_body: bool = False,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Stream the send history of the current user's campaigns as CSV or NDJSON, newest first
+    """
+    _check_format(format)
+    columns = EMAIL_SENT_COLUMNS + (["body"] if include_body else [])
+    query = (
+        select(*[getattr(EmailSent, c) for c in columns])
+        .join(Campaign, Campaign.id == EmailSent.campaign_id)
+        .where(Campaign.user_id == current_user.id)
+    )
+    if campaign_id is not None:
+        query = query.where(EmailSent.campaign_id == campaign_id)
+    if status:
+        query = query.where(EmailSent.status == status)
+    query = query.order_by(EmailSent.created_at.desc(), EmailSent.id.desc())
+    return _export_response(stream_query(query, columns, format), "emails-sent", format)
+
+@router.get("/export/search/{search_id}")
+async def export_search_leads(search_id: str, format: str = Query("csv")):
+    """
+    Export the leads of a /search run (kept in memory while the search is live)
+    """
+    from app.api.email_routes import search_leads
+
+    _check_format(format)
+    if search_id not in search_leads:
+        raise HTTPException(status_code=404, detail="Search not found")
+
+    leads = list(search_leads[search_id])
+    columns = [name for name, _ in SEARCH_LEAD_COLUMNS] + ["scraped_emails"]
+
+    def rows():
+        if format == "csv":
+            yield csv_header(columns)
+        for start in range(0, len(leads), 500):
+            yield encode_rows(
+                [
+                    [lead.get(key) for _, key in SEARCH_LEAD_COLUMNS]
+                    + [";".join(e.get("email", "") for e in lead.get("scrapedEmails") or [])]
+                    for lead in leads[start:start + 500]
+                ],
+                columns,
+                format
+            )
+
+    return _export_response(rows(), f"search-{search_id}", format)
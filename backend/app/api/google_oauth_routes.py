@@ -1,20 +1,19 @@
 from fastapi import APIRouter, HTTPException, Request, Depends
 from fastapi.responses import RedirectResponse
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import Flow
-from googleapiclient.discovery import build
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 import os
 import json
 import base64
 from email.mime.text import MIMEText
 from dotenv import load_dotenv
 
-from app.database import get_db
+from app.database import get_async_db
 from app.models import User, Session as UserSession
 from app.models.campaign import EmailSent
-from app.auth import hash_password, generate_session_token, get_session_expiry
+from app.models.campaign_stats import record_send_result
+from app.auth import make_unusable_password, generate_session_token, get_session_expiry
 from datetime import datetime
 
 # Load environment variables
@@ -42,20 +41,14 @@ CLIENT_CONFIG = {
     }
 }
 
-# Debug: Print loaded credentials (remove in production)
-print("=" * 50)
-print("GOOGLE OAUTH CONFIG LOADED:")
-print(f"Client ID: {os.getenv('GOOGLE_CLIENT_ID')}")
-print(f"Client Secret: {os.getenv('GOOGLE_CLIENT_SECRET')[:10]}..." if os.getenv('GOOGLE_CLIENT_SECRET') else "Client Secret: None")
-print(f"Redirect URI: {os.getenv('GOOGLE_REDIRECT_URI')}")
-print("=" * 50)
-
 @router.get("/oauth/authorize")
 async def authorize():
     """
     Start OAuth2 flow - redirect user to Google consent screen
     """
     try:
+        from google_auth_oauthlib.flow import Flow
+
         flow = Flow.from_client_config(
             CLIENT_CONFIG,
             scopes=SCOPES,
@@ -76,11 +69,14 @@ async def authorize():
         raise HTTPException(status_code=500, detail=f"OAuth initialization failed: {str(e)}")
 
 @router.get("/oauth/callback")
-async def oauth_callback(code: str, state: str, db: Session = Depends(get_db)):
+async def oauth_callback(code: str, state: str, db: AsyncSession = Depends(get_async_db)):
     """
     Handle OAuth2 callback from Google - Also creates/updates user account
     """
     try:
+        from google_auth_oauthlib.flow import Flow
+        from googleapiclient.discovery import build
+
         flow = Flow.from_client_config(
             CLIENT_CONFIG,
             scopes=SCOPES,
@@ -109,18 +105,18 @@ async def oauth_callback(code: str, state: str, db: Session = Depends(get_db)):
         }
 
         # Create or get user in database
-        user = db.query(User).filter(User.email == user_email).first()
+        user = await db.scalar(select(User).where(User.email == user_email))
         if not user:
             # Create new user (OAuth users don't have passwords)
             user = User(
                 email=user_email,
-                hashed_password=hash_password("oauth_user_no_password"),  # Placeholder
+                hashed_password=make_unusable_password(),  # Placeholder, no bcrypt needed
                 full_name=user_email.split('@')[0].title(),
                 is_active=True
             )
             db.add(user)
-            db.commit()
-            db.refresh(user)
+            await db.commit()
+            await db.refresh(user)
 
         # Create session token for user
         session_token = generate_session_token()
@@ -130,7 +126,7 @@ async def oauth_callback(code: str, state: str, db: Session = Depends(get_db)):
             expires_at=get_session_expiry(30)  # 30 days
         )
         db.add(session)
-        db.commit()
+        await db.commit()
 
         # Redirect to frontend with session token
         frontend_url = os.getenv("FRONTEND_URL", "http://localhost:3000")
@@ -177,12 +173,14 @@ class GmailSendRequest(BaseModel):
     from_email: str  # Which connected Gmail account to send from
 
 @router.post("/oauth/send-email")
-async def send_email_via_oauth(request: GmailSendRequest, db: Session = Depends(get_db)):
+async def send_email_via_oauth(request: GmailSendRequest, db: AsyncSession = Depends(get_async_db)):
     """
     Send email using Gmail API with OAuth credentials
     """
     # Check if already sent to this email (duplicate prevention)
-    existing = db.query(EmailSent).filter(EmailSent.recipient_email == request.to_email).first()
+    existing = await db.scalar(
+        select(EmailSent.id).where(EmailSent.recipient_email == request.to_email).limit(1)
+    )
     if existing:
         return {
             "success": True,
@@ -200,6 +198,9 @@ async def send_email_via_oauth(request: GmailSendRequest, db: Session = Depends(
     error_message = None
 
     try:
+        from google.oauth2.credentials import Credentials
+        from googleapiclient.discovery import build
+
         creds_data = user_credentials[request.from_email]
 
         credentials = Credentials(
@@ -245,11 +246,12 @@ async def send_email_via_oauth(request: GmailSendRequest, db: Session = Depends(
                 error_message=None
             )
             db.add(email_sent)
-            db.commit()
+            await record_send_result(db, None, request.from_email, True)
+            await db.commit()
             print(f"✓ OAuth email saved to database: {request.to_email} - Status: sent")
         except Exception as db_error:
             print(f"✗ Database save failed for OAuth email {request.to_email}: {str(db_error)}")
-            db.rollback()
+            await db.rollback()
 
         return {
             "success": True,
@@ -274,10 +276,11 @@ async def send_email_via_oauth(request: GmailSendRequest, db: Session = Depends(
                 error_message=error_message
             )
             db.add(email_sent)
-            db.commit()
+            await record_send_result(db, None, request.from_email, False)
+            await db.commit()
             print(f"✓ OAuth failed email saved to database: {request.to_email} - Status: failed")
         except Exception as db_error:
             print(f"✗ Database save failed for OAuth email {request.to_email}: {str(db_error)}")
-            db.rollback()
+            await db.rollback()
 
         raise HTTPException(status_code=500, detail=f"Failed to send email: {error_message}")
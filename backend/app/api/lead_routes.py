@@ -0,0 +1,106 @@
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from typing import Optional
+import logging
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_db
+from app.models import LeadList, User
+from app.api.auth_routes import get_current_user
+from app.services.lead_import import (
+    LeadImportError, import_leads, iter_lines, iter_csv_records, iter_ndjson_records
+)
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl", "application/json")
+
+def _upload_format(request: Request, format: Optional[str]) -> str:
+    if format:
+        if format not in ("csv", "ndjson"):
+            raise HTTPException(status_code=400, detail="Unsupported format. Use csv or ndjson")
+        return format
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    return "ndjson" if content_type in NDJSON_CONTENT_TYPES else "csv"
+
+async def _mark_import_failed(db: AsyncSession, lead_list: LeadList):
+    # The rollback expires lead_list; reload it before touching it (no lazy loads on AsyncSession)
+    await db.rollback()
+    await db.refresh(lead_list)
+    lead_list.status = "failed"
+    await db.commit()
+
+@router.post("/leads/import")
+async def import_lead_list(
+    request: Request,
+    name: str = Query(..., min_length=1, max_length=255),
+    format: Optional[str] = None,
+    skip_contacted: bool = True,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Import leads from a raw CSV or NDJSON request body into a new lead list
+
+    The body is read as a stream and processed in batches, so large uploads never sit in memory.
+    CSV needs a header row with at least an email column; NDJSON is one object per line.
+    Use the returned list_id as lead_list_id when starting a campaign or sending emails.
+    """
+    upload_format = _upload_format(request, format)
+
+    lead_list = LeadList(user_id=current_user.id, name=name, source_format=upload_format, status="importing")
+    db.add(lead_list)
+    await db.commit()
+    list_id = lead_list.id
+
+    lines = iter_lines(request.stream())
+    records = iter_csv_records(lines) if upload_format == "csv" else iter_ndjson_records(lines)
+    try:
+        summary = await import_leads(db, lead_list, records, skip_contacted=skip_contacted)
+    except LeadImportError as e:
+        await _mark_import_failed(db, lead_list)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.exception("Lead import failed for list %s", list_id)
+        await _mark_import_failed(db, lead_list)
+        raise HTTPException(status_code=500, detail=f"Lead import failed: {str(e)}")
+
+    return {
+        "success": True,
+        "list_id": lead_list.id,
+        "name": lead_list.name,
+        **summary
+    }
+
+@router.get("/lead-lists")
+async def get_lead_lists(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get the current user's imported lead lists
+    """
+    lists = (await db.scalars(
+        select(LeadList)
+        .where(LeadList.user_id == current_user.id)
+        .order_by(LeadList.created_at.desc())
+    )).all()
+
+    return {
+        "success": True,
+        "lead_lists": [
+            {
+                "id": l.id,
+                "name": l.name,
+                "status": l.status,
+                "source_format": l.source_format,
+                "total_rows": l.total_rows,
+                "imported": l.imported,
+                "duplicates": l.duplicates,
+                "invalid": l.invalid,
+                "created_at": l.created_at.isoformat()
+            }
+            for l in lists
+        ]
+    }
@@ -1,14 +1,119 @@
-from passlib.context import CryptContext
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Optional, Tuple
+import asyncio
+import os
 import secrets
+import threading
+import time
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt cost factor - changing it rehashes existing passwords on next login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# Dedicated pool for password hashing so login bursts don't fill the default
+# threadpool that serves every other sync endpoint (bcrypt releases the GIL)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+
+# Marker prefix for accounts that can't log in with a password (OAuth users)
+UNUSABLE_PASSWORD_PREFIX = "!"
+
+_hash_executor = None
+_metrics_lock = threading.Lock()
+_hash_metrics = {
+    "hash_calls": 0,
+    "verify_calls": 0,
+    "rehashes": 0,
+    "queued": 0,
+    "in_flight": 0,
+    "total_seconds": 0.0,
+    "max_seconds": 0.0,
+}
+
+@lru_cache(maxsize=None)
+def get_pwd_context():
+    """passlib context, imported and built on first use"""
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    if not hashed_password or hashed_password.startswith(UNUSABLE_PASSWORD_PREFIX):
+        return False
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password and return a new hash if the stored one uses an outdated cost"""
+    if not hashed_password or hashed_password.startswith(UNUSABLE_PASSWORD_PREFIX):
+        return False, None
+    return get_pwd_context().verify_and_update(plain_password, hashed_password)
+
+def make_unusable_password() -> str:
+    """Placeholder hash for accounts without a password - never matches, costs nothing"""
+    return UNUSABLE_PASSWORD_PREFIX + secrets.token_urlsafe(16)
+
+def _run_timed(func, *args):
+    with _metrics_lock:
+        _hash_metrics["queued"] -= 1
+        _hash_metrics["in_flight"] += 1
+    started = time.perf_counter()
+    try:
+        return func(*args)
+    finally:
+        elapsed = time.perf_counter() - started
+        with _metrics_lock:
+            _hash_metrics["in_flight"] -= 1
+            _hash_metrics["total_seconds"] += elapsed
+            _hash_metrics["max_seconds"] = max(_hash_metrics["max_seconds"], elapsed)
+
+def _get_hash_executor() -> ThreadPoolExecutor:
+    global _hash_executor
+    if _hash_executor is None:
+        _hash_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+    return _hash_executor
+
+async def _submit(counter: str, func, *args):
+    with _metrics_lock:
+        _hash_metrics[counter] += 1
+        _hash_metrics["queued"] += 1
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_hash_executor(), _run_timed, func, *args)
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the dedicated hashing pool"""
+    return await _submit("hash_calls", hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the dedicated hashing pool"""
+    return await _submit("verify_calls", verify_password, plain_password, hashed_password)
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password on the hashing pool, returning a rehash when the cost changed"""
+    valid, new_hash = await _submit("verify_calls", verify_and_update_password, plain_password, hashed_password)
+    if new_hash:
+        with _metrics_lock:
+            _hash_metrics["rehashes"] += 1
+    return valid, new_hash
+
+def get_hashing_metrics() -> dict:
+    """Snapshot of password hashing pool usage"""
+    with _metrics_lock:
+        metrics = dict(_hash_metrics)
+    calls = metrics["hash_calls"] + metrics["verify_calls"]
+    completed = calls - metrics["queued"] - metrics["in_flight"]
+    metrics["avg_seconds"] = round(metrics["total_seconds"] / completed, 4) if completed else 0.0
+    metrics["workers"] = PASSWORD_HASH_WORKERS
+    metrics["bcrypt_rounds"] = BCRYPT_ROUNDS
+    return metrics
+
+def shutdown_hash_executor():
+    """Stop the hashing pool (called on application shutdown)"""
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+        _hash_executor = None
 
 def generate_session_token() -> str:
     return secrets.token_urlsafe(32)
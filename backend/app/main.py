@@ -1,43 +1,84 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from app.api import email_routes, follow_up_routes, google_oauth_routes, campaign_routes, auth_routes
-from app.database import engine, Base
+from contextlib import asynccontextmanager
+import asyncio
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
+# Load environment variables from .env file (before modules read their settings)
 load_dotenv()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
-app = FastAPI(title="FabianTech Lead Generation API", version="1.0.0")
-
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:3000", "http://127.0.0.1:3000"],  # Specify frontend URLs
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-    expose_headers=["*"],  # Expose all headers in responses
-)
-
-# Include routers
-app.include_router(auth_routes.router, prefix="/api/auth", tags=["authentication"])
-app.include_router(email_routes.router, prefix="/api", tags=["emails"])
-app.include_router(follow_up_routes.router, prefix="/api", tags=["follow-ups"])
-app.include_router(google_oauth_routes.router, prefix="/api", tags=["google-oauth"])
-app.include_router(campaign_routes.router, prefix="/api", tags=["campaigns"])
-
-@app.get("/")
-async def root():
-    return {
-        "message": "FabianTech Lead Generation API v2.0",
-        "version": "2.0.0",
-        "status": "online",
-        "features": ["email_scraping", "progress_tracking", "smtp_sending"]
-    }
-
-@app.get("/health")
-async def health_check():
-    return {"status": "healthy"}
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from app.api import email_routes, follow_up_routes, google_oauth_routes, campaign_routes, auth_routes, export_routes, lead_routes
+from app.database import engine, async_engine, SessionLocal, Base, ensure_columns, ensure_indexes
+from app.auth import shutdown_hash_executor
+from app.models import follow_up
+from app.models.campaign_stats import backfill_campaign_stats
+from app.services.session_reaper import run_session_reaper
+from app.services.ai_cache import run_ai_cache_reaper
+from app.services.ai_client import close_client
+from app.services.html_extract import shutdown_parse_pool
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Schema setup and background tasks run once per process, not at import time
+    """
+    # Create database tables
+    Base.metadata.create_all(bind=engine)
+    ensure_columns()
+    ensure_indexes()
+    follow_up.init_db()
+    with SessionLocal() as db:
+        if backfill_campaign_stats(db):
+            print("✓ Campaign stats built from existing sent emails")
+
+    # Background maintenance tasks started with the app
+    background_tasks = [asyncio.create_task(run_session_reaper()), asyncio.create_task(run_ai_cache_reaper())]
+
+    yield
+
+    for task in background_tasks:
+        task.cancel()
+    shutdown_hash_executor()
+    shutdown_parse_pool()
+    await close_client()
+    await async_engine.dispose()
+
+def create_app() -> FastAPI:
+    """Build the API application"""
+    app = FastAPI(title="FabianTech Lead Generation API", version="1.0.0", lifespan=lifespan)
+
+    # CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["http://localhost:3000", "http://127.0.0.1:3000"],  # Specify frontend URLs
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["*"],  # Expose all headers in responses
+    )
+
+    # Include routers
+    app.include_router(auth_routes.router, prefix="/api/auth", tags=["authentication"])
+    app.include_router(email_routes.router, prefix="/api", tags=["emails"])
+    app.include_router(follow_up_routes.router, prefix="/api", tags=["follow-ups"])
+    app.include_router(google_oauth_routes.router, prefix="/api", tags=["google-oauth"])
+    app.include_router(campaign_routes.router, prefix="/api", tags=["campaigns"])
+    app.include_router(lead_routes.router, prefix="/api", tags=["leads"])
+    app.include_router(export_routes.router, prefix="/api", tags=["exports"])
+
+    @app.get("/")
+    async def root():
+        return {
+            "message": "FabianTech Lead Generation API v2.0",
+            "version": "2.0.0",
+            "status": "online",
+            "features": ["email_scraping", "progress_tracking", "smtp_sending"]
+        }
+
+    @app.get("/health")
+    async def health_check():
+        return {"status": "healthy"}
+
+    return app
+
+app = create_app()
@@ -1,5 +1,11 @@
 # Database models package
-from .user import User, Session, SearchHistory, Lead
-from .campaign import Campaign, EmailSent
+from .user import User, Session, SearchHistory, LeadList, Lead
+from .campaign import Campaign, EmailSent, PersonalizedEmail
+from .campaign_stats import CampaignStats, CampaignDailyStats
+from .send_quota import SendQuota, SendQuotaOverride
 from .scraped_email import *
 from .follow_up import *
+from .ai_cache import AICacheEntry
+from .contact_path import ContactPathCache
+from .page_validator import PageValidator
+from .email_frequency import EmailDomainSighting, EmailFrequency
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -8,11 +8,11 @@ class Campaign(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
-    name = Column(String, nullable=False)
-    subject = Column(String, nullable=False)
+    name = Column(String(255), nullable=False)
+    subject = Column(String(500), nullable=False)
     body = Column(Text, nullable=False)
-    sender_email = Column(String, nullable=False)
-    status = Column(String, default="draft")
+    sender_email = Column(String(255), nullable=False)
+    status = Column(String(50), default="draft")
     max_emails_per_hour = Column(Integer, default=20)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -27,14 +27,42 @@ class EmailSent(Base):
     id = Column(Integer, primary_key=True, index=True)
     campaign_id = Column(Integer, ForeignKey("campaigns.id"))
     lead_id = Column(Integer)
-    recipient_email = Column(String, nullable=False)
-    recipient_name = Column(String)
-    subject = Column(String, nullable=False)
+    recipient_email = Column(String(255), nullable=False)
+    recipient_name = Column(String(255))
+    subject = Column(String(500), nullable=False)
     body = Column(Text, nullable=False)
-    status = Column(String, nullable=False)
+    status = Column(String(50), nullable=False)
     sent_at = Column(DateTime, nullable=True)
     error_message = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Relationships
     campaign = relationship("Campaign", back_populates="emails_sent")
+
+    # Keyset pagination on (created_at, id), optionally narrowed by campaign or status
+    __table_args__ = (
+        Index('idx_emails_sent_created', 'created_at', 'id'),
+        Index('idx_emails_sent_campaign_created', 'campaign_id', 'created_at', 'id'),
+        Index('idx_emails_sent_status_created', 'status', 'created_at', 'id'),
+        # Already-contacted checks in the senders and lead import
+        Index('idx_emails_sent_recipient', 'recipient_email'),
+    )
+
+class PersonalizedEmail(Base):
+    __tablename__ = "personalized_emails"
+
+    id = Column(Integer, primary_key=True, index=True)
+    campaign_id = Column(Integer, ForeignKey("campaigns.id"), nullable=False)
+    lead_id = Column(Integer, nullable=False)
+    recipient_email = Column(String(255), nullable=False)
+    recipient_name = Column(String(255))
+    prompt_hash = Column(String(64), nullable=False, index=True)  # Identical prompts share one model call
+    subject = Column(String(500), nullable=True)
+    body = Column(Text, nullable=True)
+    status = Column(String(50), nullable=False)  # ready, failed
+    error_message = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index('idx_personalized_campaign_lead', 'campaign_id', 'lead_id', unique=True),
+    )
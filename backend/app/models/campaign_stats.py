@@ -0,0 +1,126 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime, Index, case, func, select, insert, literal
+from datetime import datetime
+from typing import Optional
+from app.database import Base, build_upsert
+
+# Counter rows for sends that don't belong to a campaign (/send-emails, /oauth/send-email)
+DIRECT_SEND_CAMPAIGN_ID = 0
+
+class CampaignStats(Base):
+    """Running sent/failed totals per campaign - one row per campaign"""
+    __tablename__ = "campaign_stats"
+
+    id = Column(Integer, primary_key=True, index=True)
+    campaign_id = Column(Integer, nullable=False)
+    sent = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    last_sent_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index('idx_campaign_stats_campaign', 'campaign_id', unique=True),
+    )
+
+class CampaignDailyStats(Base):
+    """Sent/failed counts per campaign, UTC day and sending account"""
+    __tablename__ = "campaign_daily_stats"
+
+    id = Column(Integer, primary_key=True, index=True)
+    campaign_id = Column(Integer, nullable=False)
+    day = Column(Date, nullable=False)
+    sender_email = Column(String(255), nullable=False, default="")
+    sent = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index('idx_campaign_daily_stats_key', 'campaign_id', 'day', 'sender_email', unique=True),
+        Index('idx_campaign_daily_stats_sender_day', 'sender_email', 'day'),
+    )
+
+async def record_send_result(
+    db,
+    campaign_id: Optional[int],
+    sender_email: Optional[str],
+    success: bool,
+    at: Optional[datetime] = None
+):
+    """
+    Bump the campaign and daily counters for one send attempt
+    Runs in the caller's transaction so counters commit together with the EmailSent row
+    """
+    at = at or datetime.utcnow()
+    campaign_id = campaign_id or DIRECT_SEND_CAMPAIGN_ID
+    sent, failed = (1, 0) if success else (0, 1)
+    dialect_name = db.get_bind().dialect.name
+
+    totals = CampaignStats.__table__
+    await db.execute(build_upsert(
+        dialect_name,
+        totals,
+        [{
+            'campaign_id': campaign_id,
+            'sent': sent,
+            'failed': failed,
+            'last_sent_at': at if success else None,
+            'updated_at': at
+        }],
+        index_elements=['campaign_id'],
+        update=lambda excluded: {
+            'sent': totals.c.sent + excluded.sent,
+            'failed': totals.c.failed + excluded.failed,
+            'last_sent_at': func.coalesce(excluded.last_sent_at, totals.c.last_sent_at),
+            'updated_at': excluded.updated_at
+        }
+    ))
+
+    daily = CampaignDailyStats.__table__
+    await db.execute(build_upsert(
+        dialect_name,
+        daily,
+        [{
+            'campaign_id': campaign_id,
+            'day': at.date(),
+            'sender_email': (sender_email or "").lower(),
+            'sent': sent,
+            'failed': failed
+        }],
+        index_elements=['campaign_id', 'day', 'sender_email'],
+        update=lambda excluded: {
+            'sent': daily.c.sent + excluded.sent,
+            'failed': daily.c.failed + excluded.failed
+        }
+    ))
+
+def backfill_campaign_stats(db) -> bool:
+    """
+    Build the counter tables from emails_sent when they are still empty
+    (databases created before the counters existed). Returns True if it ran.
+    """
+    from app.models.campaign import Campaign, EmailSent
+
+    if db.query(CampaignStats.id).first() is not None:
+        return False
+    if db.query(EmailSent.id).first() is None:
+        return False
+
+    sent = func.sum(case((EmailSent.status == "sent", 1), else_=0))
+    failed = func.sum(case((EmailSent.status == "sent", 0), else_=1))
+    campaign_key = func.coalesce(EmailSent.campaign_id, literal(DIRECT_SEND_CAMPAIGN_ID))
+
+    db.execute(insert(CampaignStats).from_select(
+        ['campaign_id', 'sent', 'failed', 'last_sent_at', 'updated_at'],
+        select(campaign_key, sent, failed, func.max(EmailSent.sent_at), func.max(EmailSent.created_at))
+        .group_by(campaign_key)
+    ))
+
+    day = func.date(EmailSent.created_at)
+    sender = func.lower(func.coalesce(Campaign.sender_email, literal("")))
+    db.execute(insert(CampaignDailyStats).from_select(
+        ['campaign_id', 'day', 'sender_email', 'sent', 'failed'],
+        select(campaign_key, day, sender, sent, failed)
+        .select_from(EmailSent)
+        .outerjoin(Campaign, Campaign.id == EmailSent.campaign_id)
+        .group_by(campaign_key, day, sender)
+    ))
+    db.commit()
+    return True
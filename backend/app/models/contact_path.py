@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from datetime import datetime
+from app.database import Base
+
+class ContactPathCache(Base):
+    """What a candidate contact path returned last time we scraped a domain"""
+    __tablename__ = "contact_path_cache"
+
+    id = Column(Integer, primary_key=True, index=True)
+    domain = Column(String(255), nullable=False)  # registrable domain, shared by www./shop. hosts
+    path = Column(String(500), nullable=False)
+    outcome = Column(String(20), nullable=False)  # "hit", "missing", "homepage_redirect"
+    checked_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+    __table_args__ = (
+        Index('idx_contact_path_domain_path', 'domain', 'path', unique=True),
+    )
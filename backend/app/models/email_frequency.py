@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from datetime import datetime
+from app.database import Base
+
+class EmailDomainSighting(Base):
+    """A scraped email seen on a site of another registrable domain than its own"""
+    __tablename__ = "email_domain_sightings"
+
+    id = Column(Integer, primary_key=True, index=True)
+    email = Column(String(255), nullable=False)
+    domain = Column(String(255), nullable=False)  # registrable domain of the site it was on
+    first_seen = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_seen = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index('idx_email_sighting_email_domain', 'email', 'domain', unique=True),
+    )
+
+class EmailFrequency(Base):
+    """On how many unrelated domains an email has been seen - agency and platform addresses rank high"""
+    __tablename__ = "email_frequency"
+
+    id = Column(Integer, primary_key=True, index=True)
+    email = Column(String(255), nullable=False, unique=True)
+    domain_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index('idx_email_frequency_count', 'domain_count'),
+    )
@@ -159,6 +159,3 @@ def get_follow_ups_by_lead(lead_id: int):
     ]
 
     return [dict(zip(columns, row)) for row in rows]
-
-# Initialize database on import
-init_db()
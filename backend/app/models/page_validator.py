@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from datetime import datetime
+from app.database import Base
+
+class PageValidator(Base):
+    """HTTP validators and the extraction result of the last full fetch of a scraped page"""
+    __tablename__ = "page_validators"
+
+    id = Column(Integer, primary_key=True, index=True)
+    url_hash = Column(String(64), unique=True, index=True, nullable=False)  # sha256 of the normalized URL
+    url = Column(Text, nullable=False)
+    etag = Column(String(255), nullable=True)
+    last_modified = Column(String(64), nullable=True)
+    content_hash = Column(String(64), nullable=True)  # sha256 of the bytes that were parsed
+    extraction = Column(Text, nullable=False)  # JSON {"emails", "links"}
+    fetched_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
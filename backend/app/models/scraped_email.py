@@ -1,9 +1,8 @@
 from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index
-from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 from datetime import datetime
-
-Base = declarative_base()
+from typing import List, Dict
+from app.database import Base, build_upsert
 
 class ScrapedEmail(Base):
     __tablename__ = "scraped_emails"
@@ -20,7 +19,6 @@ class ScrapedEmail(Base):
 
     __table_args__ = (
         Index('idx_lead_email', 'lead_id', 'email', unique=True),
-        Index('idx_category', 'category'),
     )
 
 class EmailLog(Base):
@@ -39,7 +37,56 @@ class EmailLog(Base):
     created_at = Column(DateTime, default=func.now(), nullable=False)
 
     __table_args__ = (
-        Index('idx_status', 'status'),
-        Index('idx_category', 'category'),
-        Index('idx_sent_at', 'sent_at'),
+        # Index names are global in SQLite/PostgreSQL, so they carry the table name
+        Index('idx_email_log_status', 'status'),
+        Index('idx_email_log_sent_at', 'sent_at'),
     )
+
+# Rows per INSERT statement - keeps every statement under SQLite's default bound-parameter
+# limit (999 before 3.32), one parameter per column per row
+SQLITE_MAX_PARAMETERS = 999
+UPSERT_BATCH_SIZE = SQLITE_MAX_PARAMETERS // len(ScrapedEmail.__table__.columns)
+
+def scraped_email_rows(lead_id: int, scraped_emails: List[Dict]) -> List[Dict]:
+    """Convert EmailScraper results into scraped_emails rows"""
+    now = datetime.utcnow()
+    rows = []
+    for item in scraped_emails:
+        scraped_at = item.get('scraped_at')
+        rows.append({
+            'lead_id': lead_id,
+            'email': item['email'],
+            'source': item.get('source', 'unknown'),
+            'category': item.get('category') or 'unknown',
+            'scraped_at': datetime.fromisoformat(scraped_at) if scraped_at else now,
+            'verified': bool(item.get('verified', False)),
+            'created_at': now,
+            'updated_at': now
+        })
+    return rows
+
+async def upsert_scraped_emails(db, rows: List[Dict]) -> int:
+    """
+    Insert scraped emails in bulk, refreshing existing (lead_id, email) pairs in place
+    Uses the idx_lead_email unique index as the conflict target; the caller commits
+    """
+    if not rows:
+        return 0
+
+    dialect_name = db.get_bind().dialect.name
+    table = ScrapedEmail.__table__
+    for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+        stmt = build_upsert(
+            dialect_name,
+            table,
+            rows[start:start + UPSERT_BATCH_SIZE],
+            index_elements=['lead_id', 'email'],
+            update=lambda excluded: {
+                'source': excluded.source,
+                'category': excluded.category,
+                'scraped_at': excluded.scraped_at,
+                'updated_at': excluded.updated_at
+            }
+        )
+        await db.execute(stmt)
+    return len(rows)
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime, Index
+from datetime import datetime
+from app.database import Base
+
+class SendQuota(Base):
+    """Emails sent per account per UTC day - the durable daily limit ledger"""
+    __tablename__ = "send_quotas"
+
+    id = Column(Integer, primary_key=True, index=True)
+    account_email = Column(String(255), nullable=False)
+    day = Column(Date, nullable=False)
+    sent_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index('idx_send_quota_account_day', 'account_email', 'day', unique=True),
+    )
+
+class SendQuotaOverride(Base):
+    """Per-account daily limit replacing the DAILY_EMAIL_LIMIT default"""
+    __tablename__ = "send_quota_overrides"
+
+    id = Column(Integer, primary_key=True, index=True)
+    account_email = Column(String(255), nullable=False, unique=True)
+    daily_limit = Column(Integer, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -7,9 +7,9 @@ class User(Base):
     __tablename__ = "users"
 
     id = Column(Integer, primary_key=True, index=True)
-    email = Column(String, unique=True, index=True, nullable=False)
-    hashed_password = Column(String, nullable=False)
-    full_name = Column(String)
+    email = Column(String(255), unique=True, index=True, nullable=False)
+    hashed_password = Column(String(255), nullable=False)
+    full_name = Column(String(255))
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     last_login = Column(DateTime, default=datetime.utcnow)
@@ -17,47 +17,82 @@ class User(Base):
     # Relationships
     campaigns = relationship("Campaign", back_populates="user")
     searches = relationship("SearchHistory", back_populates="user")
+    lead_lists = relationship("LeadList", back_populates="user")
 
 class Session(Base):
     __tablename__ = "sessions"
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
-    session_token = Column(String, unique=True, index=True, nullable=False)
+    session_token = Column(String(255), unique=True, index=True, nullable=False)
     expires_at = Column(DateTime, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        # Covers the token + expiry lookup in get_current_user
+        Index('idx_session_token_expires', 'session_token', 'expires_at'),
+        # Lets the reaper find expired rows without a table scan
+        Index('idx_session_expires_at', 'expires_at'),
+    )
+
 class SearchHistory(Base):
     __tablename__ = "search_history"
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
-    search_id = Column(String, unique=True, index=True)
-    query = Column(String, nullable=False)
-    location = Column(String, nullable=False)
+    search_id = Column(String(100), unique=True, index=True)
+    query = Column(String(255), nullable=False)
+    location = Column(String(255), nullable=False)
     max_results = Column(Integer, nullable=False)
     results_count = Column(Integer, default=0)
-    status = Column(String, default="searching")
+    status = Column(String(50), default="searching")
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Relationships
     user = relationship("User", back_populates="searches")
     leads = relationship("Lead", back_populates="search")
 
+class LeadList(Base):
+    """A named set of leads created by a bulk import"""
+    __tablename__ = "lead_lists"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    name = Column(String(255), nullable=False)
+    source_format = Column(String(20), nullable=False)  # csv, ndjson
+    status = Column(String(50), default="importing")  # importing, completed, failed
+    total_rows = Column(Integer, default=0)
+    imported = Column(Integer, default=0)
+    duplicates = Column(Integer, default=0)
+    invalid = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Relationships
+    user = relationship("User", back_populates="lead_lists")
+    leads = relationship("Lead", back_populates="lead_list")
+
 class Lead(Base):
     __tablename__ = "leads"
 
     id = Column(Integer, primary_key=True, index=True)
     search_id = Column(Integer, ForeignKey("search_history.id"))
-    name = Column(String, nullable=False)
-    email = Column(String, nullable=True)
-    phone = Column(String, nullable=True)
-    website = Column(String, nullable=True)
-    address = Column(String, nullable=True)
-    google_maps_url = Column(String, nullable=True)
-    business_category = Column(String, nullable=True)
-    status = Column(String, default="new")
+    list_id = Column(Integer, ForeignKey("lead_lists.id"), nullable=True)
+    name = Column(String(255), nullable=False)
+    email = Column(String(255), nullable=True)
+    phone = Column(String(50), nullable=True)
+    website = Column(String(1000), nullable=True)
+    address = Column(String(500), nullable=True)
+    google_maps_url = Column(String(1000), nullable=True)
+    business_category = Column(String(255), nullable=True)
+    status = Column(String(50), default="new")
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Relationships
     search = relationship("SearchHistory", back_populates="leads")
+    lead_list = relationship("LeadList", back_populates="leads")
+
+    __table_args__ = (
+        # Dedupe lookups during import and list loading for campaigns
+        Index('idx_leads_email', 'email'),
+        Index('idx_leads_list_id', 'list_id', 'id'),
+    )
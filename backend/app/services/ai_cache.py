@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional, Sequence
+
+from sqlalchemy import select
+
+from app.database import AsyncSessionLocal
+from app.models.ai_cache import AICacheEntry
+from app.services.reaper import reap_expired_rows, run_reaper
+
+# AI result cache settings - set AI_CACHE_ENABLED=false to always call the model
+AI_CACHE_ENABLED = os.getenv("AI_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+AI_CACHE_TTL = int(os.getenv("AI_CACHE_TTL", str(7 * 24 * 3600)))  # seconds
+AI_CACHE_MAX_ENTRIES = int(os.getenv("AI_CACHE_MAX_ENTRIES", "2000"))
+# How often expired ai_cache rows are swept and how many are deleted per transaction
+AI_CACHE_REAPER_INTERVAL = int(os.getenv("AI_CACHE_REAPER_INTERVAL", "3600"))
+AI_CACHE_REAPER_BATCH_SIZE = int(os.getenv("AI_CACHE_REAPER_BATCH_SIZE", "500"))
+
+def make_cache_key(kind: str, parts: Sequence[Optional[str]], casefold: bool = True) -> str:
+    """
+    Build a stable key from the request inputs
+    Whitespace is always collapsed; case is folded only where it can't change the output
+    """
+    normalized = []
+    for part in parts:
+        text = " ".join((part or "").split())
+        normalized.append(text.lower() if casefold else text)
+    raw = kind + "\x1f" + "\x1f".join(normalized)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+class AIResultCache:
+    """
+    Two-level cache for AI results: an in-memory LRU in front of the ai_cache table
+    """
+
+    def __init__(self, max_entries: int = AI_CACHE_MAX_ENTRIES, ttl: int = AI_CACHE_TTL, enabled: bool = AI_CACHE_ENABLED):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.enabled = enabled
+        self._entries = OrderedDict()  # key -> (expires_at timestamp, value)
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "db_hits": 0, "misses": 0, "writes": 0}
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    def _remember(self, key: str, value: dict, expires_at: float):
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _get_memory(self, key: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    async def _load(self, key: str):
+        async with AsyncSessionLocal() as db:
+            entry = await db.scalar(
+                select(AICacheEntry).where(
+                    AICacheEntry.cache_key == key,
+                    AICacheEntry.expires_at > datetime.utcnow()
+                )
+            )
+            if not entry:
+                return None
+            return json.loads(entry.value), entry.expires_at
+
+    async def _store(self, key: str, kind: str, value: dict, expires_at: datetime):
+        async with AsyncSessionLocal() as db:
+            try:
+                entry = await db.scalar(select(AICacheEntry).where(AICacheEntry.cache_key == key))
+                if entry is None:
+                    entry = AICacheEntry(cache_key=key, kind=kind)
+                    db.add(entry)
+                entry.value = json.dumps(value)
+                entry.created_at = datetime.utcnow()
+                entry.expires_at = expires_at
+                await db.commit()
+            except Exception as e:
+                await db.rollback()
+                print(f"[Non-fatal] Failed to persist AI cache entry: {str(e)}")
+
+    async def get(self, key: str) -> Optional[dict]:
+        """Return a cached result or None"""
+        if not self.enabled:
+            return None
+
+        value = self._get_memory(key)
+        if value is not None:
+            self._count("memory_hits")
+            return value
+
+        loaded = await self._load(key)
+        if loaded is None:
+            self._count("misses")
+            return None
+
+        value, expires_at = loaded
+        self._remember(key, value, time.time() + (expires_at - datetime.utcnow()).total_seconds())
+        self._count("db_hits")
+        return value
+
+    async def set(self, key: str, kind: str, value: dict):
+        """Store a result in memory and in the database"""
+        if not self.enabled:
+            return
+        self._remember(key, value, time.time() + self.ttl)
+        self._count("writes")
+        await self._store(key, kind, value, datetime.utcnow() + timedelta(seconds=self.ttl))
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._entries)
+        lookups = stats["memory_hits"] + stats["db_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["db_hits"]) / lookups, 3) if lookups else 0.0
+        stats["enabled"] = self.enabled
+        stats["ttl_seconds"] = self.ttl
+        return stats
+
+    def clear_memory(self):
+        with self._lock:
+            self._entries.clear()
+
+# Shared cache used by the AI endpoints
+ai_result_cache = AIResultCache()
+
+def reap_expired_ai_cache(batch_size: int = AI_CACHE_REAPER_BATCH_SIZE) -> int:
+    """Delete expired ai_cache rows in batches; returns the number of deleted rows"""
+    return reap_expired_rows(AICacheEntry, AICacheEntry.expires_at, batch_size)
+
+async def run_ai_cache_reaper(interval: int = AI_CACHE_REAPER_INTERVAL):
+    """Background loop that periodically removes expired AI cache rows"""
+    await run_reaper("AI cache reaper", "expired entries", reap_expired_ai_cache, interval)
@@ -0,0 +1,107 @@
+import asyncio
+import os
+from typing import AsyncIterator, Optional
+
+import httpx
+
+# OpenAI settings - one client is shared by every AI endpoint
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4")
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "60"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "20"))
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))
+
+_client = None
+_concurrency = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+
+class AIConfigurationError(Exception):
+    """Raised when the OpenAI API key is not configured"""
+
+def get_client():
+    """Return the shared async OpenAI client, creating it on first use"""
+    global _client
+    if _client is None:
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise AIConfigurationError(
+                "OpenAI API key not configured. Please set OPENAI_API_KEY environment variable."
+            )
+
+        from openai import AsyncOpenAI
+
+        # Pooled keep-alive connections instead of a fresh TLS handshake per request
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=OPENAI_MAX_CONNECTIONS,
+                max_keepalive_connections=OPENAI_MAX_CONNECTIONS
+            ),
+            timeout=OPENAI_TIMEOUT
+        )
+        _client = AsyncOpenAI(
+            api_key=api_key,
+            timeout=OPENAI_TIMEOUT,
+            max_retries=OPENAI_MAX_RETRIES,
+            http_client=http_client
+        )
+    return _client
+
+async def chat_completion(
+    system_prompt: str,
+    user_prompt: str,
+    max_tokens: int,
+    temperature: float = 0.7,
+    model: Optional[str] = None
+) -> str:
+    """
+    Run a chat completion on the shared client and return the stripped text
+    Concurrent calls are capped so a burst of AI requests can't exhaust the pool
+    """
+    client = get_client()
+    async with _concurrency:
+        response = await client.chat.completions.create(
+            model=model or OPENAI_MODEL,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+    return response.choices[0].message.content.strip()
+
+async def stream_chat_completion(
+    system_prompt: str,
+    user_prompt: str,
+    max_tokens: int,
+    temperature: float = 0.7,
+    model: Optional[str] = None
+) -> AsyncIterator[str]:
+    """
+    Run a streaming chat completion and yield content deltas as they arrive
+    The concurrency slot is held until the stream is fully consumed
+    """
+    client = get_client()
+    async with _concurrency:
+        stream = await client.chat.completions.create(
+            model=model or OPENAI_MODEL,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True
+        )
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+
+async def close_client():
+    """Close the shared client (called on application shutdown)"""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
@@ -0,0 +1,129 @@
+import json
+from typing import List, Tuple
+
+SUBJECT_MARKER = "SUBJECT:"
+BODY_MARKER = "BODY:"
+# Characters to wait for SUBJECT: before treating the completion as plain body text
+MARKER_WAIT_CHARS = 40
+
+def format_sse(event: str, data: dict) -> str:
+    """Encode one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def _partial_marker_length(text: str, marker: str) -> int:
+    """Length of the longest suffix of text that could be the start of marker"""
+    for size in range(min(len(marker) - 1, len(text)), 0, -1):
+        if text.endswith(marker[:size]):
+            return size
+    return 0
+
+class SubjectBodyStreamParser:
+    """
+    Incrementally split a "SUBJECT: ... BODY: ..." completion into subject and body deltas
+
+    feed() returns a list of (section, delta) pairs ready to be sent to the client, and
+    finish() flushes what is still held back once the completion has ended.
+    Text that might be the beginning of a marker is held back until the next chunk.
+    If no SUBJECT: shows up within marker_wait characters (or before the end), the model ignored
+    the format: everything is streamed as body, or with first_line_subject the first line is the
+    subject and the rest the body, as parse_generated_email does (the final done event still
+    carries the parsed result).
+    """
+
+    def __init__(self, expect_subject: bool = True, marker_wait: int = MARKER_WAIT_CHARS, first_line_subject: bool = False):
+        self.marker_wait = marker_wait
+        self.first_line_subject = first_line_subject
+        self._section = "preamble" if expect_subject else "body"
+        self._buffer = ""
+        self.raw = ""
+        self.subject = ""
+        self.body = ""
+
+    def _emit(self, section: str, text: str, events: List[Tuple[str, str]]):
+        current = self.subject if section == "subject" else self.body
+        if not current:
+            text = text.lstrip()
+        if not text:
+            return
+        if section == "subject":
+            self.subject += text
+        else:
+            self.body += text
+        events.append((section, text))
+
+    def _without_markers(self):
+        # Restart from everything received so far, split the way parse_generated_email would
+        self._buffer = self.raw.lstrip()
+        self._section = "first_line" if self.first_line_subject else "body"
+
+    def feed(self, delta: str) -> List[Tuple[str, str]]:
+        self.raw += delta
+        self._buffer += delta
+        return self._drain()
+
+    def finish(self) -> List[Tuple[str, str]]:
+        """Emit whatever feed() held back; call once after the last chunk"""
+        if self._section == "preamble":
+            self._without_markers()
+        events = self._drain()
+        if self._section == "first_line":
+            # A single line without markers is both the subject and the body
+            line = self._buffer.strip()
+            self._emit("subject", line, events)
+            self._emit("body", line, events)
+        elif self._section == "subject":
+            self._emit("subject", self._buffer.rstrip(), events)
+        else:
+            self._emit("body", self._buffer, events)
+        self._buffer = ""
+        return events
+
+    def _drain(self) -> List[Tuple[str, str]]:
+        events = []
+
+        while True:
+            if self._section == "preamble":
+                index = self._buffer.find(SUBJECT_MARKER)
+                if index == -1 and len(self.raw) >= self.marker_wait:
+                    # No marker in sight - fall back to the unformatted split
+                    self._without_markers()
+                    continue
+                if index == -1:
+                    # Keep only what could still turn into the marker
+                    keep = _partial_marker_length(self._buffer, SUBJECT_MARKER)
+                    self._buffer = self._buffer[len(self._buffer) - keep:] if keep else ""
+                    break
+                self._buffer = self._buffer[index + len(SUBJECT_MARKER):]
+                self._section = "subject"
+                continue
+
+            if self._section == "first_line":
+                index = self._buffer.find("\n")
+                if index == -1:
+                    # Held until the line ends - finish() decides if it is the whole email
+                    break
+                self._emit("subject", self._buffer[:index].strip(), events)
+                self._buffer = self._buffer[index + 1:]
+                self._section = "body"
+                continue
+
+            if self._section == "subject":
+                index = self._buffer.find(BODY_MARKER)
+                if index == -1:
+                    keep = _partial_marker_length(self._buffer, BODY_MARKER)
+                    ready = self._buffer[:len(self._buffer) - keep]
+                    # Hold trailing whitespace - it belongs between subject and body
+                    stripped = ready.rstrip()
+                    self._emit("subject", stripped, events)
+                    self._buffer = self._buffer[len(stripped):]
+                    break
+                self._emit("subject", self._buffer[:index].rstrip(), events)
+                self._buffer = self._buffer[index + len(BODY_MARKER):]
+                self._section = "body"
+                continue
+
+            self._emit("body", self._buffer, events)
+            self._buffer = ""
+            break
+
+        return events
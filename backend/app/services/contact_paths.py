@@ -0,0 +1,73 @@
+import os
+from datetime import datetime, timedelta
+from typing import Dict
+
+from sqlalchemy import delete, select
+
+from app.database import AsyncSessionLocal, build_upsert
+from app.models.contact_path import ContactPathCache
+
+# How long a recorded path outcome is trusted before the path is probed again
+CONTACT_PATH_CACHE_TTL = int(os.getenv("CONTACT_PATH_CACHE_TTL", str(30 * 24 * 3600)))  # seconds
+CONTACT_PATH_CACHE_ENABLED = os.getenv("CONTACT_PATH_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+
+HIT = "hit"
+MISSING = "missing"
+HOMEPAGE_REDIRECT = "homepage_redirect"
+
+def normalize_path(path: str) -> str:
+    """Cache key for a path: lowercase, no trailing slash, no query or fragment"""
+    path = path.split("#")[0].split("?")[0].strip().lower().rstrip("/")
+    return path or "/"
+
+async def get_contact_paths(domain: str) -> Dict[str, str]:
+    """Unexpired outcomes recorded for a registrable domain, path -> outcome"""
+    if not CONTACT_PATH_CACHE_ENABLED or not domain:
+        return {}
+    async with AsyncSessionLocal() as db:
+        rows = await db.execute(
+            select(ContactPathCache.path, ContactPathCache.outcome).where(
+                ContactPathCache.domain == domain,
+                ContactPathCache.expires_at > datetime.utcnow()
+            )
+        )
+        return {row.path: row.outcome for row in rows}
+
+async def record_contact_paths(domain: str, outcomes: Dict[str, str]):
+    """
+    Store the outcome of every path probed in one scrape
+    A path that held an email replaces the domain's previous hit, so the cache always
+    points at the page that worked most recently.
+    """
+    if not CONTACT_PATH_CACHE_ENABLED or not domain or not outcomes:
+        return
+    now = datetime.utcnow()
+    expires_at = now + timedelta(seconds=CONTACT_PATH_CACHE_TTL)
+    rows = [
+        {'domain': domain, 'path': path[:500], 'outcome': outcome, 'checked_at': now, 'expires_at': expires_at}
+        for path, outcome in outcomes.items()
+    ]
+    async with AsyncSessionLocal() as db:
+        try:
+            if HIT in outcomes.values():
+                await db.execute(
+                    delete(ContactPathCache).where(
+                        ContactPathCache.domain == domain,
+                        ContactPathCache.outcome == HIT
+                    )
+                )
+            await db.execute(build_upsert(
+                db.get_bind().dialect.name,
+                ContactPathCache.__table__,
+                rows,
+                index_elements=['domain', 'path'],
+                update=lambda excluded: {
+                    'outcome': excluded.outcome,
+                    'checked_at': excluded.checked_at,
+                    'expires_at': excluded.expires_at
+                }
+            ))
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            print(f"[Non-fatal] Failed to record contact paths for {domain}: {str(e)}")
@@ -0,0 +1,96 @@
+import heapq
+import itertools
+import os
+from typing import Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+from app.services.url_utils import normalize_url, registrable_domain
+
+# Pages fetched per site after the homepage
+SCRAPER_MAX_PAGES = int(os.getenv("SCRAPER_MAX_PAGES", "20"))
+# Link hops from the homepage that are still followed
+SCRAPER_MAX_DEPTH = int(os.getenv("SCRAPER_MAX_DEPTH", "2"))
+
+# How likely a page is to list an email, by words in its path or anchor text
+KEYWORD_SCORES = (
+    ('contact', 10), ('kontakt', 10), ('impressum', 9), ('imprint', 9),
+    ('touch', 8), ('reach', 8), ('about', 6), ('team', 5), ('staff', 5),
+    ('support', 4), ('help', 4), ('info', 3)
+)
+# Anchor text counts a bit less than the URL itself
+ANCHOR_TEXT_WEIGHT = 0.6
+# Linked pages are known to exist, guessed paths aren't
+DISCOVERED_BONUS = 3
+# Every hop away from the homepage costs this much
+DEPTH_PENALTY = 4
+
+def keyword_score(text: str) -> int:
+    text = text.lower()
+    return max((score for keyword, score in KEYWORD_SCORES if keyword in text), default=0)
+
+class CrawlFrontier:
+    """
+    Priority queue of pages to fetch for one site
+
+    URLs are normalized and deduplicated before they are queued, only pages on the
+    site's registrable domain are accepted, and pop() hands out the best scored page
+    until the page budget is spent.
+    """
+
+    def __init__(self, start_url: str, max_pages: int = SCRAPER_MAX_PAGES, max_depth: int = SCRAPER_MAX_DEPTH):
+        self.start_url = start_url
+        self.domain = registrable_domain(start_url)
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.fetched = 0
+        self._heap = []
+        self._order = itertools.count()  # FIFO among equal scores
+        self._seen = set()
+
+    def mark_seen(self, url: str):
+        """Record a URL fetched outside the frontier (the homepage and where it redirected)"""
+        key = normalize_url(urljoin(self.start_url, url))
+        if key:
+            self._seen.add(key)
+
+    def score(self, url: str, anchor_text: str = "", depth: int = 1, discovered: bool = True) -> float:
+        path = urlparse(url).path
+        score = keyword_score(path) + ANCHOR_TEXT_WEIGHT * keyword_score(anchor_text)
+        if discovered:
+            score += DISCOVERED_BONUS
+        return score - DEPTH_PENALTY * (depth - 1)
+
+    def add(
+        self,
+        href: str,
+        anchor_text: str = "",
+        depth: int = 1,
+        discovered: bool = True,
+        boost: float = 0,
+        base: Optional[str] = None
+    ) -> bool:
+        """Queue a link (relative to base, the homepage by default); False if duplicate or off-site"""
+        if depth > self.max_depth:
+            return False
+        url = urljoin(base or self.start_url, href.strip())
+        key = normalize_url(url)
+        if not key or key in self._seen or registrable_domain(url) != self.domain:
+            return False
+        self._seen.add(key)
+        priority = self.score(url, anchor_text, depth, discovered) + boost
+        heapq.heappush(self._heap, (-priority, next(self._order), url, depth, discovered))
+        return True
+
+    def pop(self) -> Optional[Tuple[str, int, bool]]:
+        """Next (url, depth, discovered) to consider, or None when empty or out of budget"""
+        if not self._heap or self.fetched >= self.max_pages:
+            return None
+        _, _, url, depth, discovered = heapq.heappop(self._heap)
+        return url, depth, discovered
+
+    def record_fetch(self):
+        """Count a request against the page budget (skipped candidates don't count)"""
+        self.fetched += 1
+
+    def __len__(self) -> int:
+        return len(self._heap)
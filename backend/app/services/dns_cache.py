@@ -0,0 +1,156 @@
+import asyncio
+import ipaddress
+import os
+import socket
+import time
+from collections import OrderedDict
+from typing import List, Optional
+
+import httpcore
+import httpx
+from httpcore import AnyIOBackend, AsyncNetworkBackend, AsyncNetworkStream
+
+# Shared resolver cache for the scraper - getaddrinfo reports no TTLs, so these are fixed
+DNS_CACHE_TTL = int(os.getenv("DNS_CACHE_TTL", "300"))  # seconds a resolved host is reused
+DNS_NEGATIVE_TTL = int(os.getenv("DNS_NEGATIVE_TTL", "900"))  # seconds a non-existent host fails instantly
+DNS_CACHE_MAX_ENTRIES = int(os.getenv("DNS_CACHE_MAX_ENTRIES", "10000"))
+DNS_RESOLVE_TIMEOUT = float(os.getenv("DNS_RESOLVE_TIMEOUT", "5"))
+
+# getaddrinfo errors that mean the name does not exist (as opposed to a resolver hiccup)
+NEGATIVE_ERRORS = {socket.EAI_NONAME, getattr(socket, "EAI_NODATA", socket.EAI_NONAME)}
+
+class DNSCache:
+    """
+    Async, TTL-bound cache of host -> addresses
+
+    Concurrent lookups of the same host share one getaddrinfo call, and hosts that don't
+    exist (NXDOMAIN) are remembered so they fail without touching the resolver again.
+    """
+
+    def __init__(self, ttl: int = DNS_CACHE_TTL, negative_ttl: int = DNS_NEGATIVE_TTL, max_entries: int = DNS_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # host -> (expires_at, addresses or None)
+        self._inflight = {}  # host -> asyncio.Task
+        self._stats = {"hits": 0, "negative_hits": 0, "lookups": 0, "coalesced": 0}
+
+    def _remember(self, host: str, addresses: Optional[List[str]], ttl: int):
+        self._entries[host] = (time.monotonic() + ttl, addresses)
+        self._entries.move_to_end(host)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _lookup(self, host: str) -> Optional[List[str]]:
+        loop = asyncio.get_running_loop()
+        self._stats["lookups"] += 1
+        try:
+            infos = await loop.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            if e.errno in NEGATIVE_ERRORS:
+                self._remember(host, None, self.negative_ttl)
+                return None
+            raise
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        self._remember(host, addresses, self.ttl)
+        return addresses
+
+    def _finish(self, host: str, task: asyncio.Task):
+        self._inflight.pop(host, None)
+        if not task.cancelled():
+            task.exception()  # retrieved here in case every waiter gave up
+
+    async def resolve(self, host: str, timeout: Optional[float] = DNS_RESOLVE_TIMEOUT) -> List[str]:
+        """
+        Addresses for a host, cached; raises httpcore.ConnectError if it doesn't resolve
+        IP literals are returned as they are.
+        """
+        host = host.lower().rstrip(".")
+        try:
+            ipaddress.ip_address(host)
+            return [host]
+        except ValueError:
+            pass
+
+        entry = self._entries.get(host)
+        if entry is not None:
+            expires_at, addresses = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(host)
+                if addresses is None:
+                    self._stats["negative_hits"] += 1
+                    raise httpcore.ConnectError(f"Host does not exist (cached): {host}")
+                self._stats["hits"] += 1
+                return addresses
+            del self._entries[host]
+
+        task = self._inflight.get(host)
+        if task is None:
+            task = asyncio.ensure_future(self._lookup(host))
+            self._inflight[host] = task
+            task.add_done_callback(lambda done: self._finish(host, done))
+        else:
+            self._stats["coalesced"] += 1
+
+        try:
+            # shield: one caller timing out must not cancel the lookup the others wait on
+            addresses = await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            raise httpcore.ConnectTimeout(f"DNS lookup timed out: {host}")
+        except OSError as e:
+            raise httpcore.ConnectError(f"DNS lookup failed for {host}: {str(e)}")
+        if addresses is None:
+            raise httpcore.ConnectError(f"Host does not exist: {host}")
+        return addresses
+
+    def get_stats(self) -> dict:
+        return dict(self._stats, entries=len(self._entries), inflight=len(self._inflight))
+
+    def clear(self):
+        self._entries.clear()
+
+# Shared by every scraper client in this process
+dns_cache = DNSCache()
+
+class CachingNetworkBackend(AsyncNetworkBackend):
+    """
+    httpcore network backend that resolves hosts through dns_cache and connects to the IP
+    TLS still uses the original host name for SNI and certificate checks (httpcore passes it
+    separately to start_tls), so only the lookup changes.
+    """
+
+    def __init__(self, cache: DNSCache = dns_cache):
+        self.cache = cache
+        self._backend = AnyIOBackend()
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None) -> AsyncNetworkStream:
+        addresses = await self.cache.resolve(host, timeout=timeout or DNS_RESOLVE_TIMEOUT)
+        error = None
+        for address in addresses[:3]:
+            try:
+                return await self._backend.connect_tcp(
+                    address, port, timeout=timeout, local_address=local_address, socket_options=socket_options
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                error = e
+        raise error
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None) -> AsyncNetworkStream:
+        return await self._backend.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+def caching_transport(limits: httpx.Limits = httpx.Limits()) -> httpx.AsyncHTTPTransport:
+    """An httpx transport whose connections resolve hosts through dns_cache"""
+    transport = httpx.AsyncHTTPTransport(limits=limits)
+    # httpx 0.25 takes no network_backend argument, so give the transport an equivalent pool that has one
+    # (_pool is private - httpcore is pinned in requirements.txt for this)
+    transport._pool = httpcore.AsyncConnectionPool(
+        ssl_context=httpx.create_ssl_context(),
+        max_connections=limits.max_connections,
+        max_keepalive_connections=limits.max_keepalive_connections,
+        keepalive_expiry=limits.keepalive_expiry,
+        network_backend=CachingNetworkBackend()
+    )
+    return transport
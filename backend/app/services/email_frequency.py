@@ -0,0 +1,80 @@
+import os
+from datetime import datetime
+from typing import Dict, Iterable, Set
+
+from sqlalchemy import func, select
+
+from app.database import build_upsert
+from app.models.email_frequency import EmailDomainSighting, EmailFrequency
+from app.services.url_utils import registrable_domain
+
+# Emails seen on more than this many unrelated domains are treated as shared (agency, platform)
+SHARED_EMAIL_DOMAIN_LIMIT = int(os.getenv("SHARED_EMAIL_DOMAIN_LIMIT", "5"))
+# "suppress" drops shared emails from sends; "flag" only marks them in scrape results
+SHARED_EMAIL_ACTION = os.getenv("SHARED_EMAIL_ACTION", "suppress").lower()
+
+def email_domain(email: str) -> str:
+    return registrable_domain(email.rsplit("@", 1)[-1]) or ""
+
+def is_shared(domain_count: int) -> bool:
+    return domain_count > SHARED_EMAIL_DOMAIN_LIMIT
+
+async def record_email_sightings(db, domain: str, emails: Iterable[str]) -> Dict[str, int]:
+    """
+    Record that emails were found on a site and return each one's unrelated-domain count
+    A business's own address (same registrable domain as the site) is not a sighting.
+    The caller commits.
+    """
+    emails = list(dict.fromkeys(email.lower() for email in emails))
+    foreign = [email for email in emails if domain and email_domain(email) != domain]
+    counts = {email: 0 for email in emails}
+    if not foreign:
+        return counts
+
+    now = datetime.utcnow()
+    dialect_name = db.get_bind().dialect.name
+    await db.execute(build_upsert(
+        dialect_name,
+        EmailDomainSighting.__table__,
+        [{'email': email, 'domain': domain, 'first_seen': now, 'last_seen': now} for email in foreign],
+        index_elements=['email', 'domain'],
+        update=lambda excluded: {'last_seen': excluded.last_seen}
+    ))
+
+    # Recount from the sightings so concurrent scrapes can't drift the totals
+    rows = await db.execute(
+        select(EmailDomainSighting.email, func.count())
+        .where(EmailDomainSighting.email.in_(foreign))
+        .group_by(EmailDomainSighting.email)
+    )
+    for email, count in rows:
+        counts[email] = count
+    await db.execute(build_upsert(
+        dialect_name,
+        EmailFrequency.__table__,
+        [{'email': email, 'domain_count': counts[email], 'updated_at': now} for email in foreign],
+        index_elements=['email'],
+        update=lambda excluded: {'domain_count': excluded.domain_count, 'updated_at': excluded.updated_at}
+    ))
+    return counts
+
+async def get_shared_emails(db, emails: Iterable[str]) -> Set[str]:
+    """The emails among these seen on more than SHARED_EMAIL_DOMAIN_LIMIT unrelated domains"""
+    emails = list({email.lower() for email in emails if email})
+    if not emails:
+        return set()
+    shared = set()
+    for start in range(0, len(emails), 500):
+        shared.update(await db.scalars(
+            select(EmailFrequency.email).where(
+                EmailFrequency.email.in_(emails[start:start + 500]),
+                EmailFrequency.domain_count > SHARED_EMAIL_DOMAIN_LIMIT
+            )
+        ))
+    return shared
+
+async def get_suppressed_emails(db, emails: Iterable[str]) -> Set[str]:
+    """Shared emails to leave out of sends (none when SHARED_EMAIL_ACTION is flag)"""
+    if SHARED_EMAIL_ACTION != "suppress":
+        return set()
+    return await get_shared_emails(db, emails)
@@ -1,13 +1,77 @@
-import re
+import asyncio
+import hashlib
+import os
+import time
+import httpcore
 import httpx
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
+from collections import OrderedDict, deque
+from urllib.parse import urlparse
 from datetime import datetime
-from typing import List, Dict
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+from app.services.html_extract import EMAIL_PATTERN, SCRAPER_PARSE_WORKERS, HTMLExtractor, extract_page_async
+from app.services.contact_paths import (
+    HIT, MISSING, HOMEPAGE_REDIRECT, get_contact_paths, record_contact_paths, normalize_path
+)
+from app.services.crawl_frontier import CrawlFrontier
+from app.services.dns_cache import dns_cache, caching_transport
+from app.services.email_frequency import record_email_sightings, is_shared
+from app.database import AsyncSessionLocal
+from app.services.page_validators import (
+    get_page_validator, save_page_validator, touch_page_validator, conditional_headers
+)
+from app.services.url_utils import registrable_domain
+
+# Bytes read from any single page - the rest of the body is never downloaded
+SCRAPER_MAX_PAGE_BYTES = int(os.getenv("SCRAPER_MAX_PAGE_BYTES", str(1024 * 1024)))
+# Bytes read across all pages of one site
+SCRAPER_MAX_SITE_BYTES = int(os.getenv("SCRAPER_MAX_SITE_BYTES", str(4 * 1024 * 1024)))
+# Content types worth scanning; anything else (PDFs, images, archives) is dropped after the headers
+SCRAPER_CONTENT_TYPES = tuple(
+    t.strip().lower()
+    for t in os.getenv("SCRAPER_CONTENT_TYPES", "text/html,application/xhtml+xml,text/plain").split(",")
+    if t.strip()
+)
+# Page fetches are cut off after this many seconds so results are saved before the caller's 15s timeout
+SCRAPER_SITE_TIME_BUDGET = float(os.getenv("SCRAPER_SITE_TIME_BUDGET", "12"))
+# scrape_many: sites scraped at once, sites per registrable domain at once, and the cap per site
+SCRAPER_CONCURRENCY = int(os.getenv("SCRAPER_CONCURRENCY", "10"))
+SCRAPER_PER_HOST_CONCURRENCY = int(os.getenv("SCRAPER_PER_HOST_CONCURRENCY", "2"))
+SCRAPER_SITE_TIMEOUT = float(os.getenv("SCRAPER_SITE_TIMEOUT", "15"))
+# Time allowed for a candidate page to start answering (connect and first byte)
+SCRAPER_PROBE_TIMEOUT = float(os.getenv("SCRAPER_PROBE_TIMEOUT", "3"))
+# Error pages up to this size are read to the end so the connection can be reused
+SCRAPER_MISS_DRAIN_BYTES = int(os.getenv("SCRAPER_MISS_DRAIN_BYTES", str(16 * 1024)))
+SCRAPER_HOST_MEMORY = int(os.getenv("SCRAPER_HOST_MEMORY", "5000"))
+
+# Common page variations to check when the homepage doesn't link them
+COMMON_PAGES = [
+    # Contact pages
+    '/contact', '/contact-us', '/contactus', '/contact_us',
+    '/get-in-touch', '/reach-us', '/contact.html', '/contact.php',
+    # About pages
+    '/about', '/about-us', '/aboutus', '/about_us',
+    '/about.html', '/about.php',
+    # Other common pages
+    '/support', '/help', '/info', '/team'
+]
+# Score added to the page that held the email last time, so it is fetched first
+CACHED_HIT_BOOST = 100
+
+# Per-host probe strategy, shared by all scrapers in this process:
+# True = misses are expensive and HEAD works there, False = HEAD is unusable (405, slow, errors)
+_head_useful: "OrderedDict[str, bool]" = OrderedDict()
+
+def _remember_head(host: Optional[str], useful: bool):
+    if not host or _head_useful.get(host) is False:
+        return
+    _head_useful[host] = useful
+    _head_useful.move_to_end(host)
+    while len(_head_useful) > SCRAPER_HOST_MEMORY:
+        _head_useful.popitem(last=False)
 
 class EmailScraper:
     def __init__(self):
-        self.email_pattern = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+        self.email_pattern = EMAIL_PATTERN
         self.timeout = 10
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
@@ -15,154 +79,422 @@ class EmailScraper:
 
     async def scrape_website(self, url: str, business_category: str) -> List[Dict]:
         """
-        Scrape emails from a website by checking homepage and common contact/about pages
+        Scrape emails from a website: the homepage first, then the most promising linked and
+        common contact/about pages, best first, within the site's page, byte and time budgets
         """
         scraped_emails = []
-        checked_urls = set()
+        # Per-site state: remaining byte budget, final homepage URL, outcome of each probed path
+        site = {'bytes': SCRAPER_MAX_SITE_BYTES, 'homepage': None, 'outcomes': {}}
+        contact_email_found = False
+        cached_hit_found = False
+        deadline = time.monotonic() + SCRAPER_SITE_TIME_BUDGET
 
+        domain = registrable_domain(url)
         try:
-            async with httpx.AsyncClient(timeout=self.timeout, headers=self.headers, follow_redirects=True) as client:
+            known_paths = await get_contact_paths(domain)
+        except Exception as e:
+            print(f"[Non-fatal] Contact path cache unavailable for {domain}: {str(e)}")
+            known_paths = {}
+        cached_hits = {path for path, outcome in known_paths.items() if outcome == HIT}
+
+        # Sites whose domain doesn't resolve (often stale Places data) fail here, right away
+        try:
+            await dns_cache.resolve(urlparse(url).hostname or '')
+        except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+            print(f"[Non-fatal] Skipping {url} - {str(e)}")
+            return []
+
+        try:
+            async with httpx.AsyncClient(
+                timeout=self.timeout,
+                headers=self.headers,
+                follow_redirects=True,
+                transport=caching_transport()
+            ) as client:
                 # First, scrape the homepage and discover links
-                homepage_emails, discovered_links = await self._scrape_page_with_discovery(client, url, 'homepage', business_category)
+                try:
+                    homepage_emails, discovered_links = await asyncio.wait_for(
+                        self._scrape_page_with_discovery(client, url, 'homepage', business_category, site),
+                        timeout=deadline - time.monotonic()
+                    )
+                except asyncio.TimeoutError:
+                    homepage_emails, discovered_links = [], []
                 scraped_emails.extend(homepage_emails)
-                checked_urls.add(url)
-
-                # Common page variations to check
-                potential_pages = [
-                    # Contact pages
-                    '/contact', '/contact-us', '/contactus', '/contact_us',
-                    '/get-in-touch', '/reach-us', '/contact.html', '/contact.php',
-                    # About pages
-                    '/about', '/about-us', '/aboutus', '/about_us',
-                    '/about.html', '/about.php',
-                    # Other common pages
-                    '/support', '/help', '/info', '/team'
-                ]
-
-                # Add discovered links from homepage that contain contact/about keywords
+
+                # Links are resolved against where the homepage actually ended up
+                frontier = CrawlFrontier(site['homepage'] or url)
+                frontier.mark_seen(url)
+                frontier.mark_seen(site['homepage'] or url)
+
+                # Known 404s and homepage redirects aren't probed again until they expire
+                for path, outcome in known_paths.items():
+                    if outcome in (MISSING, HOMEPAGE_REDIRECT):
+                        frontier.mark_seen(path)
+                # The page that held the email last time (on this or a sibling host) goes first
+                for path in cached_hits:
+                    frontier.add(path, boost=CACHED_HIT_BOOST)
+                # Links from the homepage that mention contact/about keywords, then common paths
                 for link in discovered_links:
-                    potential_pages.append(link)
+                    frontier.add(link['href'], link['text'])
+                for path in COMMON_PAGES:
+                    frontier.add(path, discovered=False)
+
+                while time.monotonic() < deadline and site['bytes'] > 0:
+                    item = frontier.pop()
+                    if item is None:
+                        break
+                    page_url, depth, discovered = item
+                    cache_key = normalize_path(urlparse(page_url).path)
+
+                    # One contact page with an email is enough - skip the other contact variants;
+                    # once a cached hit delivered, the guessed paths are skipped too
+                    is_contact = 'contact' in cache_key
+                    if is_contact and contact_email_found:
+                        continue
+                    if cached_hit_found and not discovered:
+                        continue
 
-                # Check which pages actually exist and scrape them
-                for path in potential_pages:
                     try:
-                        page_url = urljoin(url, path)
-
-                        # Skip if already checked
-                        if page_url in checked_urls:
-                            continue
-
-                        # Quick HEAD request to check if page exists (faster than GET)
-                        head_response = await client.head(page_url, timeout=3.0)
-
-                        # If page exists (200, 301, 302), scrape it
-                        if head_response.status_code in [200, 301, 302]:
-                            checked_urls.add(page_url)
-                            source = 'contact page' if 'contact' in path.lower() else 'about page' if 'about' in path.lower() else 'info page'
-                            emails = await self._scrape_page_with_client(client, page_url, source, business_category)
-                            scraped_emails.extend(emails)
-                    except:
-                        # If HEAD fails, skip this page
+                        frontier.record_fetch()
+                        # Pages are fetched with a single GET; guessed paths only get a HEAD first
+                        # on hosts where misses were expensive and HEAD has worked
+                        if not discovered and _head_useful.get(urlparse(page_url).hostname):
+                            if not await asyncio.wait_for(self._head_exists(client, page_url), timeout=deadline - time.monotonic()):
+                                continue
+
+                        source = 'contact page' if is_contact else 'about page' if 'about' in cache_key else 'info page'
+                        # A slow page is cut off at the deadline, leaving time to save what was found
+                        emails, links = await asyncio.wait_for(
+                            self._scrape_page_with_discovery(
+                                client, page_url, source, business_category, site,
+                                stop_on_email=is_contact, probe=True, revalidate=discovered
+                            ),
+                            timeout=deadline - time.monotonic()
+                        )
+                    except Exception:
+                        # If the page fails (or runs past the deadline), skip it
                         continue
 
+                    scraped_emails.extend(emails)
+                    contact_email_found = contact_email_found or (is_contact and bool(emails))
+                    if emails:
+                        site['outcomes'][cache_key] = HIT
+                        cached_hit_found = cached_hit_found or cache_key in cached_hits
+                    for link in links:
+                        frontier.add(link['href'], link['text'], depth=depth + 1, base=page_url)
+
+                await record_contact_paths(domain, site['outcomes'])
+
                 # Remove duplicates
                 unique_emails = self._remove_duplicates(scraped_emails)
+                await self._mark_shared_emails(domain, unique_emails)
                 return unique_emails
 
         except Exception as e:
             print(f"[Non-fatal] Failed to scrape {url} - continuing with other pages. Error: {str(e)}")
             return []
 
-    async def _scrape_page_with_discovery(self, client: httpx.AsyncClient, url: str, source: str, category: str):
+    async def scrape_many(
+        self,
+        sites: Iterable[Tuple[int, str]],
+        business_category: str,
+        concurrency: int = SCRAPER_CONCURRENCY,
+        per_host: int = SCRAPER_PER_HOST_CONCURRENCY
+    ) -> AsyncIterator[Dict]:
         """
-        Scrape a page for emails AND discover contact/about page links
-        Returns: (emails, discovered_links)
+        Scrape many (lead_id, url) sites, yielding {"lead_id", "url", "emails", "error"} as each finishes
+
+        A fixed set of workers pulls sites, so at most `concurrency` sites are in flight and
+        at most `per_host` of them share a registrable domain. Sites wait in per-domain queues
+        and a free worker takes the next one whose domain is under its limit, so a crowded
+        domain never holds up the rest. Each site gets SCRAPER_SITE_TIMEOUT seconds.
+        """
+        waiting = OrderedDict()  # domain -> deque of sites not started yet
+        total = 0
+        for lead_id, url in sites:
+            waiting.setdefault(registrable_domain(url) or url, deque()).append((lead_id, url))
+            total += 1
+        active: Dict[str, int] = {}
+        slot_freed = asyncio.Condition()
+        results: asyncio.Queue = asyncio.Queue()
+
+        def take() -> Optional[Tuple[str, int, str]]:
+            for domain, pending in waiting.items():
+                if active.get(domain, 0) < per_host:
+                    lead_id, url = pending.popleft()
+                    if not pending:
+                        del waiting[domain]
+                    active[domain] = active.get(domain, 0) + 1
+                    return domain, lead_id, url
+            return None
+
+        async def scrape_one(lead_id: int, url: str) -> Dict:
+            try:
+                emails = await asyncio.wait_for(
+                    self.scrape_website(url, business_category),
+                    timeout=SCRAPER_SITE_TIMEOUT
+                )
+                return {'lead_id': lead_id, 'url': url, 'emails': emails, 'error': None}
+            except asyncio.TimeoutError:
+                return {'lead_id': lead_id, 'url': url, 'emails': [], 'error': f'Timed out after {SCRAPER_SITE_TIMEOUT:g}s'}
+            except Exception as e:
+                return {'lead_id': lead_id, 'url': url, 'emails': [], 'error': str(e)}
+
+        async def worker():
+            while True:
+                async with slot_freed:
+                    item = take()
+                    while item is None:
+                        if not waiting:
+                            return
+                        # Every remaining site is on a domain at its limit
+                        await slot_freed.wait()
+                        item = take()
+                domain, lead_id, url = item
+                try:
+                    result = await scrape_one(lead_id, url)
+                finally:
+                    async with slot_freed:
+                        active[domain] -= 1
+                        slot_freed.notify_all()
+                await results.put(result)
+
+        workers = [asyncio.create_task(worker()) for _ in range(max(1, min(concurrency, total)))]
+        try:
+            for _ in range(total):
+                yield await results.get()
+        finally:
+            # The consumer went away (client disconnected) - stop the remaining scrapes
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _mark_shared_emails(self, domain: Optional[str], emails: List[Dict]):
+        """
+        Add this site's emails to the cross-site index and flag the ones seen on more than
+        SHARED_EMAIL_DOMAIN_LIMIT unrelated domains; shared emails are moved to the end so
+        the first email (used as the lead's primary) is the business's own when there is one
+        """
+        if not domain or not emails:
+            return
+        async with AsyncSessionLocal() as db:
+            try:
+                counts = await record_email_sightings(db, domain, [e['email'] for e in emails])
+                await db.commit()
+            except Exception as e:
+                await db.rollback()
+                print(f"[Non-fatal] Failed to index emails for {domain}: {str(e)}")
+                return
+        for email_obj in emails:
+            email_obj['seen_on_domains'] = counts.get(email_obj['email'], 0)
+            email_obj['shared'] = is_shared(email_obj['seen_on_domains'])
+        emails.sort(key=lambda email_obj: email_obj['shared'])
+
+    def _is_scannable(self, response: httpx.Response) -> bool:
+        """
+        Only scan text pages - a missing Content-Type is given the benefit of the doubt
+        """
+        content_type = response.headers.get('content-type', '').split(';')[0].strip().lower()
+        return not content_type or content_type in SCRAPER_CONTENT_TYPES
+
+    async def _head_exists(self, client: httpx.AsyncClient, url: str) -> bool:
         """
+        HEAD probe for hosts that support it - True if the page should be fetched
+        A host that rejects or stalls on HEAD is remembered and gets plain GETs from then on.
+        """
+        host = urlparse(url).hostname
+        try:
+            response = await client.head(url, timeout=SCRAPER_PROBE_TIMEOUT)
+        except httpx.HTTPError:
+            _remember_head(host, False)
+            return True
+        if response.status_code in (405, 501):
+            _remember_head(host, False)
+            return True
+        return response.status_code == 200
+
+    async def _fetch_and_extract(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        site: Optional[dict] = None,
+        stop_on_email: bool = False,
+        probe: bool = False,
+        revalidate: bool = True
+    ) -> Optional[Dict[str, list]]:
+        """
+        Stream a page and extract emails and contact-like links from it
+        Reads at most SCRAPER_MAX_PAGE_BYTES (and what is left of the site budget); with
+        stop_on_email the download stops as soon as a usable email has been parsed.
+        Returns None for non-200 responses, redirects back to the homepage and content types
+        we don't scan. With probe the page must start answering within SCRAPER_PROBE_TIMEOUT,
+        and 404s and homepage redirects are noted in site['outcomes'].
+
+        With revalidate, pages fetched before are revalidated: a 304, or a body with the same
+        hash as last time, returns the stored extraction without parsing. ETag/Last-Modified
+        are only stored for bodies read to the end.
+        """
+        max_bytes = SCRAPER_MAX_PAGE_BYTES
+        if site is not None:
+            max_bytes = min(max_bytes, site['bytes'])
+        read = 0
+        complete = False
+
+        validator = None
+        if revalidate:
+            try:
+                validator = await get_page_validator(url)
+            except Exception as e:
+                print(f"[Non-fatal] Page validators unavailable for {url}: {str(e)}")
+
         try:
-            response = await client.get(url, timeout=10.0)
+            timeout = httpx.Timeout(10.0, connect=SCRAPER_PROBE_TIMEOUT, read=SCRAPER_PROBE_TIMEOUT) if probe else 10.0
+            headers = conditional_headers(validator)
+            async with client.stream('GET', url, timeout=timeout, headers=headers) as response:
+                if response.status_code == 304 and validator is not None:
+                    if site is not None and not probe:
+                        site['homepage'] = str(response.url)
+                    await touch_page_validator(url)
+                    return validator['extraction']
+                if response.status_code != 200:
+                    if probe:
+                        if site is not None and response.status_code in (404, 410):
+                            site['outcomes'][normalize_path(urlparse(url).path)] = MISSING
+                        read += await self._finish_miss(response)
+                    return None
+                if site is not None:
+                    if not probe:
+                        site['homepage'] = str(response.url)
+                    elif response.history and self._same_page(str(response.url), site['homepage']):
+                        # Unknown paths bounced to the homepage, which was already scanned
+                        site['outcomes'][normalize_path(urlparse(url).path)] = HOMEPAGE_REDIRECT
+                        return None
+                if not self._is_scannable(response):
+                    return None
+
+                digest = hashlib.sha256()
+                if validator is not None or (SCRAPER_PARSE_WORKERS > 0 and not stop_on_email):
+                    # Buffer (up to the cap) so an unchanged page can skip parsing and large
+                    # pages can go to the parse pool in one piece
+                    chunks = []
+                    async for chunk in response.aiter_bytes():
+                        chunk = chunk[:max_bytes - read]
+                        chunks.append(chunk)
+                        digest.update(chunk)
+                        read += len(chunk)
+                        if read >= max_bytes:
+                            break
+                    else:
+                        complete = True
+                    content_hash = digest.hexdigest()
+                    if validator is not None and validator['content_hash'] == content_hash:
+                        await touch_page_validator(url)
+                        return validator['extraction']
+                    extracted = await extract_page_async(b''.join(chunks), response.charset_encoding)
+                else:
+                    # Parse chunks as they arrive
+                    extractor = HTMLExtractor(encoding=response.charset_encoding)
+                    async for chunk in response.aiter_bytes():
+                        chunk = chunk[:max_bytes - read]
+                        extractor.feed(chunk)
+                        digest.update(chunk)
+                        read += len(chunk)
+                        if read >= max_bytes:
+                            break
+                        if stop_on_email and any(self._is_valid_email(e) for e in extractor.emails):
+                            break
+                    else:
+                        complete = True
+                    extracted = extractor.close()
+                    content_hash = digest.hexdigest()
+
+                if revalidate:
+                    # A 304 must not hand back an extraction of part of the page
+                    await save_page_validator(
+                        url,
+                        response.headers.get('etag') if complete else None,
+                        response.headers.get('last-modified') if complete else None,
+                        content_hash,
+                        extracted
+                    )
+                return extracted
+        finally:
+            if site is not None:
+                site['bytes'] -= read
+
+    def _same_page(self, url: str, other: Optional[str]) -> bool:
+        if not other:
+            return False
+        a, b = urlparse(url), urlparse(other)
+        return a.hostname == b.hostname and normalize_path(a.path) == normalize_path(b.path)
 
-            if response.status_code != 200:
+    async def _finish_miss(self, response: httpx.Response) -> int:
+        """
+        Read a small error page to the end so the connection stays reusable; returns the bytes read
+        Only an error page that is announced or found to be larger than SCRAPER_MISS_DRAIN_BYTES
+        means GET misses are expensive on this host, so HEAD is worth trying there
+        """
+        host = urlparse(str(response.url)).hostname
+        length = response.headers.get('content-length')
+        if length is not None and length.isdigit() and int(length) > SCRAPER_MISS_DRAIN_BYTES:
+            _remember_head(host, True)
+            return 0
+        drained = 0
+        async for chunk in response.aiter_bytes():
+            drained += len(chunk)
+            if drained > SCRAPER_MISS_DRAIN_BYTES:
+                _remember_head(host, True)
+                break
+        return drained
+
+    async def _scrape_page_with_discovery(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        source: str,
+        category: str,
+        site: Optional[dict] = None,
+        stop_on_email: bool = False,
+        probe: bool = False,
+        revalidate: bool = True
+    ):
+        """
+        Scrape a page for emails AND discover contact/about page links
+        Returns: (emails, discovered_links) - links as {"href", "text"}
+        """
+        try:
+            # One pass over the page: text/attribute emails, mailto targets and contact-like links
+            extracted = await self._fetch_and_extract(client, url, site, stop_on_email, probe, revalidate)
+            if extracted is None:
                 return [], []
 
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # Find all emails in the page
-            emails_found = self.email_pattern.findall(response.text)
-
-            # Also check mailto links
-            mailto_links = soup.find_all('a', href=re.compile(r'^mailto:'))
-            for link in mailto_links:
-                email = link['href'].replace('mailto:', '').split('?')[0]
-                emails_found.append(email)
-
-            # Discover links that might lead to contact/about pages
-            discovered_links = []
-            contact_keywords = ['contact', 'about', 'reach', 'touch', 'support', 'help', 'team', 'info']
-
-            all_links = soup.find_all('a', href=True)
-            for link in all_links:
-                href = link.get('href', '').lower()
-                link_text = link.get_text('', strip=True).lower()
-
-                # Check if href or link text contains contact/about keywords
-                if any(keyword in href or keyword in link_text for keyword in contact_keywords):
-                    # Only add relative or same-domain links
-                    if href.startswith('/') or href.startswith('#') or not href.startswith('http'):
-                        if not href.startswith('#'):  # Skip anchor links
-                            discovered_links.append(link.get('href'))
-
-            # Create structured email objects
-            scraped_emails = []
-            for email in set(emails_found):  # Remove duplicates
-                if self._is_valid_email(email):
-                    scraped_emails.append({
-                        'email': email.lower(),
-                        'source': source,
-                        'category': category,
-                        'scraped_at': datetime.utcnow().isoformat(),
-                        'verified': True
-                    })
-
-            return scraped_emails, discovered_links
+            discovered_links = extracted['links']
+
+            return self._build_email_objects(extracted['emails'], source, category), discovered_links
 
         except Exception as e:
             print(f"[Non-fatal] Skipping page {url} - {str(e)}")
             return [], []
 
-    async def _scrape_page_with_client(self, client: httpx.AsyncClient, url: str, source: str, category: str) -> List[Dict]:
+    async def _scrape_page_with_client(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        source: str,
+        category: str,
+        site: Optional[dict] = None,
+        stop_on_email: bool = False,
+        probe: bool = False
+    ) -> List[Dict]:
         """
         Scrape a single page for emails using existing client
         """
         try:
-            response = await client.get(url, timeout=10.0)
-
-            if response.status_code != 200:
+            extracted = await self._fetch_and_extract(client, url, site, stop_on_email, probe)
+            if extracted is None:
                 return []
 
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # Find all emails in the page
-            emails = self.email_pattern.findall(response.text)
-
-            # Also check mailto links
-            mailto_links = soup.find_all('a', href=re.compile(r'^mailto:'))
-            for link in mailto_links:
-                email = link['href'].replace('mailto:', '').split('?')[0]
-                emails.append(email)
-
-            # Create structured email objects
-            scraped_emails = []
-            for email in set(emails):  # Remove duplicates
-                if self._is_valid_email(email):
-                    scraped_emails.append({
-                        'email': email.lower(),
-                        'source': source,
-                        'category': category,
-                        'scraped_at': datetime.utcnow().isoformat(),
-                        'verified': True
-                    })
-
-            return scraped_emails
+            return self._build_email_objects(extracted['emails'], source, category)
 
         except Exception as e:
             print(f"[Non-fatal] Skipping page {url} - {str(e)}")
@@ -173,12 +505,28 @@ class EmailScraper:
         Scrape a single page for emails (wrapper for backward compatibility)
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout, headers=self.headers, follow_redirects=True) as client:
+            async with httpx.AsyncClient(timeout=self.timeout, headers=self.headers, follow_redirects=True, transport=caching_transport()) as client:
                 return await self._scrape_page_with_client(client, url, source, category)
         except Exception as e:
             print(f"[Non-fatal] Skipping page {url} - {str(e)}")
             return []
 
+    def _build_email_objects(self, emails: List[str], source: str, category: str) -> List[Dict]:
+        """
+        Create structured email objects, dropping duplicates and false positives
+        """
+        scraped_emails = []
+        for email in set(emails):  # Remove duplicates
+            if self._is_valid_email(email):
+                scraped_emails.append({
+                    'email': email.lower(),
+                    'source': source,
+                    'category': category,
+                    'scraped_at': datetime.utcnow().isoformat(),
+                    'verified': True
+                })
+        return scraped_emails
+
     def _is_valid_email(self, email: str) -> bool:
         """
         Verify email format and filter out common false positives
@@ -0,0 +1,53 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import AsyncIterator, Iterable, List, Sequence
+
+from app.database import AsyncSessionLocal
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+def _plain(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+def encode_rows(rows: Iterable[Sequence], columns: List[str], fmt: str) -> str:
+    """Serialize a batch of rows as CSV lines or NDJSON lines"""
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerows([["" if v is None else _plain(v) for v in row] for row in rows])
+        return buffer.getvalue()
+    return "".join(
+        json.dumps(dict(zip(columns, (_plain(v) for v in row))), ensure_ascii=False) + "\n"
+        for row in rows
+    )
+
+def csv_header(columns: List[str]) -> str:
+    return encode_rows([columns], columns, "csv")
+
+async def stream_query(query, columns: List[str], fmt: str) -> AsyncIterator[str]:
+    """
+    Stream the result of a select() as CSV or NDJSON
+
+    Opens its own session (the request's session is closed once the response starts)
+    and reads through a server-side cursor, so memory stays flat however many rows match.
+    """
+    if fmt == "csv":
+        yield csv_header(columns)
+
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for partition in result.partitions():
+            yield encode_rows(partition, columns, fmt)
+
+def export_filename(name: str, fmt: str) -> str:
+    return f"{name}-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.{fmt}"
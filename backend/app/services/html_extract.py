@@ -0,0 +1,171 @@
+import asyncio
+import codecs
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Union
+
+from lxml import etree
+
+# Optional process pool for parsing fetched pages - 0 keeps parsing on the event loop
+SCRAPER_PARSE_WORKERS = int(os.getenv("SCRAPER_PARSE_WORKERS", "0"))
+# Pages smaller than this are parsed inline even with the pool on (shipping them costs more)
+SCRAPER_PARSE_INLINE_BYTES = int(os.getenv("SCRAPER_PARSE_INLINE_BYTES", str(64 * 1024)))
+
+_parse_pool = None
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+
+# Links whose href or anchor text mention one of these may lead to a page with contact details
+CONTACT_KEYWORDS = ('contact', 'about', 'reach', 'touch', 'support', 'help', 'team', 'info')
+
+class PageExtractor:
+    """
+    lxml parser target that collects everything the scraper needs in one walk over the page:
+    emails in text, attributes and comments, mailto: targets, and contact-like links
+
+    Nothing is built in memory besides the results - no element tree, no second pass.
+    """
+
+    def __init__(self, keywords=CONTACT_KEYWORDS):
+        self.keywords = keywords
+        self.emails: List[str] = []
+        self.mailto: List[str] = []
+        self.links: List[Dict[str, str]] = []  # {"href", "text"} for candidate links
+        self._text: List[str] = []
+        self._anchor_href: Optional[str] = None
+        self._anchor_text: List[str] = []
+
+    def _flush_text(self):
+        if self._text:
+            text = "".join(self._text)
+            self._text = []
+            if "@" in text:
+                self.emails.extend(EMAIL_PATTERN.findall(text))
+
+    def start(self, tag, attrib):
+        self._flush_text()
+        for value in attrib.values():
+            if "@" in value:
+                self.emails.extend(EMAIL_PATTERN.findall(value))
+
+        if tag == "a":
+            href = attrib.get("href")
+            if href is not None:
+                if href[:7].lower() == "mailto:":
+                    self.mailto.append(href[7:].split("?")[0])
+                self._anchor_href = href
+                self._anchor_text = []
+
+    def end(self, tag):
+        self._flush_text()
+        if tag == "a" and self._anchor_href is not None:
+            self._add_link(self._anchor_href, "".join(self._anchor_text))
+            self._anchor_href = None
+            self._anchor_text = []
+
+    def data(self, data):
+        self._text.append(data)
+        if self._anchor_href is not None:
+            self._anchor_text.append(data)
+
+    def comment(self, text):
+        self._flush_text()
+        if "@" in text:
+            self.emails.extend(EMAIL_PATTERN.findall(text))
+
+    def _add_link(self, href: str, text: str):
+        lowered = href.lower()
+        text = text.strip().lower()
+        if not any(keyword in lowered or keyword in text for keyword in self.keywords):
+            return
+        # No in-page anchors; whether an absolute link stays on the site is up to the caller
+        if lowered.startswith("#"):
+            return
+        self.links.append({"href": href, "text": text})
+
+    def close(self) -> Dict[str, list]:
+        self._flush_text()
+        if self._anchor_href is not None:
+            self._add_link(self._anchor_href, "".join(self._anchor_text))
+            self._anchor_href = None
+        return {"emails": self.emails + self.mailto, "links": self.links}
+
+class HTMLExtractor:
+    """
+    Incremental front end for PageExtractor - feed() chunks as they arrive, close() for the result
+    Byte chunks are decoded with `encoding` (UTF-8 if unknown); undecodable bytes are replaced,
+    which never affects the ASCII addresses we are looking for.
+    """
+
+    def __init__(self, encoding: Optional[str] = None, keywords=CONTACT_KEYWORDS):
+        self.target = PageExtractor(keywords)
+        self.parser = etree.HTMLParser(target=self.target, recover=True, no_network=True)
+        try:
+            self._decoder = codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+        except LookupError:
+            self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._fed = False
+
+    @property
+    def emails(self) -> List[str]:
+        """Emails seen so far (complete only after close)"""
+        return self.target.emails + self.target.mailto
+
+    def feed(self, chunk: Union[bytes, str]):
+        if isinstance(chunk, bytes):
+            chunk = self._decoder.decode(chunk)
+        if chunk:
+            self.parser.feed(chunk)
+            self._fed = True
+
+    def close(self) -> Dict[str, list]:
+        self.feed(self._decoder.decode(b"", final=True))
+        if not self._fed:
+            return {"emails": [], "links": []}
+        try:
+            return self.parser.close()
+        except etree.XMLSyntaxError:
+            # Nothing parseable was fed - return whatever was collected
+            return self.target.close()
+
+def extract_page(content: Union[bytes, str], encoding: Optional[str] = None) -> Dict[str, list]:
+    """Extract emails and candidate links from a whole page in one pass"""
+    extractor = HTMLExtractor(encoding=encoding)
+    extractor.feed(content)
+    return extractor.close()
+
+def _get_parse_pool() -> ProcessPoolExecutor:
+    global _parse_pool
+    if _parse_pool is None:
+        # spawn: workers only import this module, never a copy of the running app
+        _parse_pool = ProcessPoolExecutor(
+            max_workers=SCRAPER_PARSE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _parse_pool
+
+async def extract_page_async(content: Union[bytes, str], encoding: Optional[str] = None) -> Dict[str, list]:
+    """
+    extract_page() on the parse pool for large pages when SCRAPER_PARSE_WORKERS > 0, inline otherwise
+    Only the page goes to the worker and only emails and links come back
+    """
+    if SCRAPER_PARSE_WORKERS <= 0 or len(content) < SCRAPER_PARSE_INLINE_BYTES:
+        return extract_page(content, encoding)
+
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(_get_parse_pool(), extract_page, content, encoding)
+    except BrokenProcessPool:
+        # A worker died (e.g. killed for memory) - start a fresh pool next time, parse this one here
+        shutdown_parse_pool()
+        return extract_page(content, encoding)
+
+def shutdown_parse_pool():
+    """Stop the parse pool (called on application shutdown)"""
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=False, cancel_futures=True)
+        _parse_pool = None
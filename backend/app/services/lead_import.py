@@ -0,0 +1,221 @@
+import codecs
+import csv
+import json
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Set
+
+from email_validator import validate_email, EmailNotValidError
+from sqlalchemy import insert, or_, select
+
+from app.models import EmailSent, Lead, LeadList, SearchHistory
+
+# Rows validated, deduplicated and inserted together
+IMPORT_BATCH_SIZE = 1000
+# Invalid rows reported back in the summary (the rest are only counted)
+MAX_REPORTED_ERRORS = 20
+
+LEAD_FIELDS = ("name", "email", "phone", "website", "address", "google_maps_url", "business_category")
+
+# Header spellings accepted for each lead field
+FIELD_ALIASES = {
+    "businesscategory": "business_category",
+    "category": "business_category",
+    "googlemapsurl": "google_maps_url",
+    "google_maps": "google_maps_url",
+    "email_address": "email",
+    "business_name": "name",
+    "company": "name",
+}
+
+# Column limits on the leads table
+FIELD_LENGTHS = {"name": 255, "email": 255, "phone": 50, "website": 1000, "address": 500,
+                 "google_maps_url": 1000, "business_category": 255}
+
+class LeadImportError(Exception):
+    """Raised when the upload can't be parsed at all (bad header, unknown format)"""
+
+def normalize_field_name(name: str) -> str:
+    key = name.strip().lower().replace(" ", "_").replace("-", "_")
+    key = FIELD_ALIASES.get(key, FIELD_ALIASES.get(key.replace("_", ""), key))
+    return key
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decode an async byte stream into lines without buffering the whole body"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        lines = pending.split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+async def iter_csv_records(lines: AsyncIterator[str]) -> AsyncIterator[Dict[str, str]]:
+    """
+    Parse CSV records from lines, keeping quoted fields that contain newlines together
+    A record is complete once it holds an even number of quote characters
+    """
+    header: Optional[List[str]] = None
+    record = ""
+    async for line in lines:
+        record = f"{record}\n{line}" if record else line
+        if record.count('"') % 2:
+            continue
+        if not record.strip():
+            record = ""
+            continue
+        values = next(csv.reader([record]))
+        record = ""
+        if header is None:
+            header = [normalize_field_name(value) for value in values]
+            if "email" not in header:
+                raise LeadImportError("CSV header must include an email column")
+            continue
+        yield dict(zip(header, values))
+
+async def iter_ndjson_records(lines: AsyncIterator[str]) -> AsyncIterator[Dict[str, str]]:
+    """Parse one JSON object per line; malformed lines come through as {"_error": ...}"""
+    async for line in lines:
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError:
+            yield {"_error": "Invalid JSON"}
+            continue
+        if not isinstance(item, dict):
+            yield {"_error": "Expected a JSON object"}
+            continue
+        yield {normalize_field_name(str(key)): value for key, value in item.items()}
+
+def clean_lead(record: Dict) -> Dict:
+    """
+    Validate and normalize one uploaded row into a leads row
+    Raises ValueError with a readable reason for rows that can't be imported
+    """
+    if "_error" in record:
+        raise ValueError(record["_error"])
+
+    raw_email = str(record.get("email") or "").strip()
+    if not raw_email:
+        raise ValueError("Missing email")
+    try:
+        email = validate_email(raw_email, check_deliverability=False).normalized.lower()
+    except EmailNotValidError as e:
+        raise ValueError(f"Invalid email {raw_email!r}: {str(e)}")
+
+    lead = {"email": email}
+    for field in LEAD_FIELDS:
+        if field == "email":
+            continue
+        value = record.get(field)
+        value = str(value).strip() if value not in (None, "") else None
+        lead[field] = value[:FIELD_LENGTHS[field]] if value else None
+    lead["name"] = lead["name"] or email
+    return lead
+
+async def _existing_lead_emails(db, user_id: int, emails: List[str]) -> Set[str]:
+    """Emails in the batch that the user already has as leads (from searches or earlier imports)"""
+    rows = await db.scalars(
+        select(Lead.email)
+        .outerjoin(SearchHistory, SearchHistory.id == Lead.search_id)
+        .outerjoin(LeadList, LeadList.id == Lead.list_id)
+        .where(
+            Lead.email.in_(emails),
+            or_(SearchHistory.user_id == user_id, LeadList.user_id == user_id)
+        )
+    )
+    return set(rows)
+
+async def _contacted_emails(db, emails: List[str]) -> Set[str]:
+    """Emails in the batch that already have a send record"""
+    rows = await db.scalars(select(EmailSent.recipient_email).where(EmailSent.recipient_email.in_(emails)))
+    return set(rows)
+
+async def import_leads(
+    db,
+    lead_list: LeadList,
+    records: AsyncIterator[Dict],
+    skip_contacted: bool = True
+) -> dict:
+    """
+    Validate, deduplicate and bulk insert streamed records into a lead list
+
+    Rows are processed in batches: duplicates are checked against the rest of the upload,
+    the user's existing leads and (optionally) EmailSent, one IN query per batch.
+    """
+    summary = {
+        "total_rows": 0,
+        "imported": 0,
+        "invalid": 0,
+        "duplicates_in_upload": 0,
+        "existing_leads": 0,
+        "already_contacted": 0,
+        "errors": []
+    }
+    seen: Set[str] = set()
+    batch: List[Dict] = []
+
+    async def flush():
+        emails = [lead["email"] for lead in batch]
+        existing = await _existing_lead_emails(db, lead_list.user_id, emails)
+        contacted = await _contacted_emails(db, emails) if skip_contacted else set()
+        now = datetime.utcnow()
+        rows = []
+        for lead in batch:
+            if lead["email"] in existing:
+                summary["existing_leads"] += 1
+            elif lead["email"] in contacted:
+                summary["already_contacted"] += 1
+            else:
+                rows.append({**lead, "list_id": lead_list.id, "status": "new", "created_at": now})
+        if rows:
+            await db.execute(insert(Lead), rows)
+        summary["imported"] += len(rows)
+        lead_list.total_rows = summary["total_rows"]
+        lead_list.imported = summary["imported"]
+        await db.commit()
+        batch.clear()
+
+    async for record in records:
+        summary["total_rows"] += 1
+        try:
+            lead = clean_lead(record)
+        except ValueError as e:
+            summary["invalid"] += 1
+            if len(summary["errors"]) < MAX_REPORTED_ERRORS:
+                summary["errors"].append({"row": summary["total_rows"], "error": str(e)})
+            continue
+
+        if lead["email"] in seen:
+            summary["duplicates_in_upload"] += 1
+            continue
+        seen.add(lead["email"])
+        batch.append(lead)
+
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            await flush()
+
+    if batch:
+        await flush()
+
+    lead_list.total_rows = summary["total_rows"]
+    lead_list.imported = summary["imported"]
+    lead_list.invalid = summary["invalid"]
+    lead_list.duplicates = summary["duplicates_in_upload"] + summary["existing_leads"] + summary["already_contacted"]
+    lead_list.status = "completed"
+    await db.commit()
+    return summary
+
+async def load_list_leads(db, user_id: int, list_id: int) -> Optional[List[dict]]:
+    """Leads of one of the user's lists as plain dicts (id, email, name), or None if not found"""
+    owned = await db.scalar(select(LeadList.id).where(LeadList.id == list_id, LeadList.user_id == user_id))
+    if owned is None:
+        return None
+    rows = (await db.execute(
+        select(Lead.id, Lead.email, Lead.name).where(Lead.list_id == list_id).order_by(Lead.id)
+    )).all()
+    return [{"id": row.id, "email": row.email, "name": row.name} for row in rows]
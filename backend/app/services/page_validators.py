@@ -0,0 +1,103 @@
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import select
+
+from app.database import AsyncSessionLocal, build_upsert
+from app.models.page_validator import PageValidator
+from app.services.url_utils import normalize_url
+
+# Re-scrapes send If-None-Match / If-Modified-Since and reuse the stored extraction on a 304
+PAGE_VALIDATORS_ENABLED = os.getenv("PAGE_VALIDATORS_ENABLED", "true").lower() in ("1", "true", "yes")
+# Stored validators older than this are ignored and the page is fetched in full
+PAGE_VALIDATOR_MAX_AGE = int(os.getenv("PAGE_VALIDATOR_MAX_AGE", str(30 * 24 * 3600)))  # seconds
+
+def url_key(url: str) -> str:
+    return hashlib.sha256((normalize_url(url) or url).encode("utf-8")).hexdigest()
+
+async def get_page_validator(url: str) -> Optional[dict]:
+    """Validators, content hash and extraction stored for a page, or None"""
+    if not PAGE_VALIDATORS_ENABLED:
+        return None
+    async with AsyncSessionLocal() as db:
+        row = await db.scalar(
+            select(PageValidator).where(
+                PageValidator.url_hash == url_key(url),
+                PageValidator.fetched_at > datetime.utcnow() - timedelta(seconds=PAGE_VALIDATOR_MAX_AGE)
+            )
+        )
+        if row is None:
+            return None
+        return {
+            'etag': row.etag,
+            'last_modified': row.last_modified,
+            'content_hash': row.content_hash,
+            'extraction': json.loads(row.extraction)
+        }
+
+def conditional_headers(validator: Optional[dict]) -> dict:
+    headers = {}
+    if validator:
+        if validator['etag']:
+            headers['If-None-Match'] = validator['etag']
+        if validator['last_modified']:
+            headers['If-Modified-Since'] = validator['last_modified']
+    return headers
+
+async def save_page_validator(
+    url: str,
+    etag: Optional[str],
+    last_modified: Optional[str],
+    content_hash: Optional[str],
+    extraction: dict
+):
+    """Store (or replace) what a full fetch of a page returned"""
+    if not PAGE_VALIDATORS_ENABLED:
+        return
+    row = {
+        'url_hash': url_key(url),
+        'url': url,
+        'etag': etag[:255] if etag else None,
+        'last_modified': last_modified[:64] if last_modified else None,
+        'content_hash': content_hash,
+        'extraction': json.dumps(extraction),
+        'fetched_at': datetime.utcnow()
+    }
+    async with AsyncSessionLocal() as db:
+        try:
+            await db.execute(build_upsert(
+                db.get_bind().dialect.name,
+                PageValidator.__table__,
+                [row],
+                index_elements=['url_hash'],
+                update=lambda excluded: {
+                    'etag': excluded.etag,
+                    'last_modified': excluded.last_modified,
+                    'content_hash': excluded.content_hash,
+                    'extraction': excluded.extraction,
+                    'fetched_at': excluded.fetched_at
+                }
+            ))
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            print(f"[Non-fatal] Failed to store page validators for {url}: {str(e)}")
+
+async def touch_page_validator(url: str):
+    """Mark a stored extraction as confirmed current (304 or unchanged content)"""
+    if not PAGE_VALIDATORS_ENABLED:
+        return
+    async with AsyncSessionLocal() as db:
+        try:
+            await db.execute(
+                PageValidator.__table__.update()
+                .where(PageValidator.url_hash == url_key(url))
+                .values(fetched_at=datetime.utcnow())
+            )
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            print(f"[Non-fatal] Failed to refresh page validators for {url}: {str(e)}")
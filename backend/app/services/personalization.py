@@ -0,0 +1,234 @@
+import asyncio
+import hashlib
+import os
+import random
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, select
+
+from app.database import AsyncSessionLocal
+from app.models.campaign import PersonalizedEmail
+from app.services.ai_client import chat_completion, AIConfigurationError
+
+# Bulk personalization settings
+PERSONALIZATION_CONCURRENCY = int(os.getenv("PERSONALIZATION_CONCURRENCY", "8"))
+PERSONALIZATION_MAX_CONCURRENCY = int(os.getenv("PERSONALIZATION_MAX_CONCURRENCY", "32"))  # cap for per-request values
+PERSONALIZATION_MAX_RETRIES = int(os.getenv("PERSONALIZATION_MAX_RETRIES", "3"))
+PERSONALIZATION_SAVE_BATCH = 50  # Rows written per transaction
+
+# In-memory job progress (like campaign_progress, it is real-time only)
+personalization_jobs = {}
+
+SYSTEM_PROMPT = """You are a professional email writing assistant. You personalize a cold outreach email template for one specific business.
+
+IMPORTANT: Keep the SAME LANGUAGE as the template.
+
+Rules:
+- Keep the offer, tone and call-to-action of the template
+- Tailor the opening and examples to the business using the details provided
+- Replace any placeholder like [Business Name] with the real value
+- Do not invent facts about the business
+- Keep it about the same length as the template
+
+You MUST respond in this EXACT format:
+SUBJECT: [personalized subject]
+BODY: [personalized body]
+
+Do not add any explanations or meta-commentary."""
+
+def build_personalization_prompt(subject: str, body: str, lead: dict, instructions: Optional[str] = None) -> str:
+    """Build the per-lead user prompt - identical leads produce identical prompts"""
+    name = lead.get("name") or ""
+    details = [f"Business name: {name}"]
+    if lead.get("business_category"):
+        details.append(f"Category: {lead['business_category']}")
+    if lead.get("website"):
+        details.append(f"Website: {lead['website']}")
+    if lead.get("address"):
+        details.append(f"Address: {lead['address']}")
+
+    prompt = (
+        "Template subject: " + subject.replace("[Business Name]", name) + "\n\n"
+        "Template body:\n" + body.replace("[Business Name]", name) + "\n\n"
+        "Business details:\n" + "\n".join(details)
+    )
+    if instructions:
+        prompt += f"\n\nAdditional instructions: {instructions}"
+    return prompt
+
+def prompt_hash(user_prompt: str) -> str:
+    return hashlib.sha256((SYSTEM_PROMPT + "\x1f" + user_prompt).encode("utf-8")).hexdigest()
+
+def parse_personalized(content: str, fallback_subject: str):
+    """Split model output into (subject, body), keeping the template subject if the format is off"""
+    if "SUBJECT:" in content and "BODY:" in content:
+        parts = content.split("BODY:", 1)
+        return parts[0].replace("SUBJECT:", "").strip(), parts[1].strip()
+    return fallback_subject, content.strip()
+
+async def _complete_with_retry(user_prompt: str, max_retries: int) -> str:
+    """Call the model, retrying transient failures with exponential backoff"""
+    attempt = 0
+    while True:
+        try:
+            return await chat_completion(SYSTEM_PROMPT, user_prompt, max_tokens=1000)
+        except AIConfigurationError:
+            raise
+        except Exception:
+            attempt += 1
+            if attempt > max_retries:
+                raise
+            await asyncio.sleep(min(30, 2 ** attempt) + random.uniform(0, 1))
+
+async def _load_ready_variants(campaign_id: int) -> Dict[str, tuple]:
+    """Previously generated variants for this campaign, keyed by prompt hash"""
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(
+            select(PersonalizedEmail.prompt_hash, PersonalizedEmail.subject, PersonalizedEmail.body).where(
+                PersonalizedEmail.campaign_id == campaign_id,
+                PersonalizedEmail.status == "ready"
+            )
+        )).all()
+        return {row.prompt_hash: (row.subject, row.body) for row in rows}
+
+def clamp_concurrency(concurrency: Optional[int]) -> int:
+    return max(1, min(concurrency or PERSONALIZATION_CONCURRENCY, PERSONALIZATION_MAX_CONCURRENCY))
+
+def dedupe_leads(leads: List[dict]) -> List[dict]:
+    """One entry per lead id (the last one wins) - the table allows one variant per lead"""
+    return list({lead["id"]: lead for lead in leads}.values())
+
+async def _save_variants(campaign_id: int, rows: List[dict]) -> Optional[str]:
+    """
+    Replace the stored variants for the given leads in one transaction
+    Returns None on success, or the error message if nothing was saved
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            lead_ids = [row["lead_id"] for row in rows]
+            await db.execute(
+                delete(PersonalizedEmail).where(
+                    PersonalizedEmail.campaign_id == campaign_id,
+                    PersonalizedEmail.lead_id.in_(lead_ids)
+                )
+            )
+            db.add_all([PersonalizedEmail(campaign_id=campaign_id, **row) for row in rows])
+            await db.commit()
+            return None
+        except Exception as e:
+            await db.rollback()
+            print(f"✗ Failed to save personalized emails for campaign {campaign_id}: {str(e)}")
+            return str(e)
+
+async def get_personalized_variants(db, campaign_id: int) -> Dict[int, tuple]:
+    """Ready variants for a campaign keyed by lead id - used by the campaign sender"""
+    rows = (await db.execute(
+        select(PersonalizedEmail.lead_id, PersonalizedEmail.subject, PersonalizedEmail.body).where(
+            PersonalizedEmail.campaign_id == campaign_id,
+            PersonalizedEmail.status == "ready"
+        )
+    )).all()
+    return {row.lead_id: (row.subject, row.body) for row in rows}
+
+async def run_personalization_job(
+    job_id: str,
+    campaign_id: int,
+    subject: str,
+    body: str,
+    leads: List[dict],
+    concurrency: int = PERSONALIZATION_CONCURRENCY,
+    instructions: Optional[str] = None,
+    max_retries: int = PERSONALIZATION_MAX_RETRIES
+):
+    """
+    Generate per-lead subject/body variants for a campaign
+
+    Model calls run with bounded concurrency; leads with identical prompts share one
+    call, and variants already stored for the campaign are reused without calling the model.
+    """
+    progress = personalization_jobs[job_id]
+    progress["status"] = "running"
+    progress.setdefault("not_saved", 0)
+
+    leads = dedupe_leads(leads)
+    known = await _load_ready_variants(campaign_id)
+    semaphore = asyncio.Semaphore(clamp_concurrency(concurrency))
+    in_flight: Dict[str, asyncio.Task] = {}
+    pending_rows: List[dict] = []
+
+    async def generate(user_prompt: str):
+        async with semaphore:
+            content = await _complete_with_retry(user_prompt, max_retries)
+        return parse_personalized(content, subject)
+
+    async def personalize(lead: dict) -> dict:
+        user_prompt = build_personalization_prompt(subject, body, lead, instructions)
+        key = prompt_hash(user_prompt)
+        row = {
+            "lead_id": lead["id"],
+            "recipient_email": lead["email"],
+            "recipient_name": lead.get("name"),
+            "prompt_hash": key,
+            "created_at": datetime.utcnow()
+        }
+
+        if key in known:
+            progress["reused"] += 1
+            row["subject"], row["body"] = known[key]
+            row["status"] = "ready"
+            return row
+
+        if key in in_flight:
+            progress["deduplicated"] += 1
+        else:
+            in_flight[key] = asyncio.ensure_future(generate(user_prompt))
+
+        try:
+            row["subject"], row["body"] = await in_flight[key]
+            row["status"] = "ready"
+        except Exception as e:
+            row["status"] = "failed"
+            row["error_message"] = str(e)
+        return row
+
+    async def save(rows: List[dict]):
+        error = await _save_variants(campaign_id, rows)
+        if error is not None:
+            # Those variants never reached the database - don't report them as ready
+            progress["completed"] -= sum(1 for row in rows if row["status"] == "ready")
+            progress["not_saved"] += len(rows)
+            progress["save_error"] = error
+
+    try:
+        for finished in asyncio.as_completed([personalize(lead) for lead in leads]):
+            row = await finished
+            pending_rows.append(row)
+
+            if row["status"] == "ready":
+                progress["completed"] += 1
+            else:
+                progress["failed"] += 1
+            progress["message"] = f"Personalized {progress['completed']}/{progress['total']} emails"
+
+            if len(pending_rows) >= PERSONALIZATION_SAVE_BATCH:
+                await save(pending_rows)
+                pending_rows = []
+
+        if pending_rows:
+            await save(pending_rows)
+
+        if progress["not_saved"]:
+            progress["status"] = "failed"
+            progress["message"] = (
+                f"Personalization finished but {progress['not_saved']} variants could not be saved: "
+                f"{progress['save_error']} ({progress['completed']} ready, {progress['failed']} failed)"
+            )
+        else:
+            progress["status"] = "completed"
+            progress["message"] = f"Personalization completed: {progress['completed']} ready, {progress['failed']} failed"
+    except Exception as e:
+        for task in in_flight.values():
+            task.cancel()
+        progress["status"] = "failed"
+        progress["message"] = f"Personalization failed: {str(e)}"
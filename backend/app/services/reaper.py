@@ -0,0 +1,45 @@
+import asyncio
+from datetime import datetime
+from typing import Callable
+
+from sqlalchemy import delete, select
+
+from app.database import SessionLocal
+
+def reap_expired_rows(model, expires_column, batch_size: int) -> int:
+    """
+    Delete rows whose expires_column is in the past, in small batches so the write lock is
+    never held for long
+    Returns the number of deleted rows
+    """
+    db = SessionLocal()
+    deleted = 0
+    try:
+        now = datetime.utcnow()
+        while True:
+            expired_ids = list(db.scalars(
+                select(model.id).where(expires_column <= now).limit(batch_size)
+            ))
+            if not expired_ids:
+                break
+
+            db.execute(delete(model).where(model.id.in_(expired_ids)))
+            db.commit()
+            deleted += len(expired_ids)
+
+            if len(expired_ids) < batch_size:
+                break
+        return deleted
+    finally:
+        db.close()
+
+async def run_reaper(name: str, what: str, reap: Callable[[], int], interval: int):
+    """Background loop that calls reap (blocking, run in a thread) every interval seconds"""
+    while True:
+        try:
+            deleted = await asyncio.to_thread(reap)
+            if deleted:
+                print(f"✓ {name} removed {deleted} {what}")
+        except Exception as e:
+            print(f"[Non-fatal] {name} failed: {str(e)}")
+        await asyncio.sleep(interval)
@@ -0,0 +1,140 @@
+import os
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, func, select
+
+from app.database import build_upsert
+from app.models.campaign import Campaign
+from app.models.send_quota import SendQuota, SendQuotaOverride
+
+# Max emails per account per UTC day, unless the account has an override
+DAILY_EMAIL_LIMIT = int(os.getenv("DAILY_EMAIL_LIMIT", "40"))
+
+def _normalize(account_email: str) -> str:
+    return account_email.strip().lower()
+
+def utc_today() -> date:
+    return datetime.utcnow().date()
+
+def _limit_expression(account_email: str):
+    """Override for the account if there is one, else the default - evaluated inside the UPDATE"""
+    override = (
+        select(SendQuotaOverride.daily_limit)
+        .where(SendQuotaOverride.account_email == account_email)
+        .scalar_subquery()
+    )
+    return func.coalesce(override, DAILY_EMAIL_LIMIT)
+
+async def reserve_send(db, account_email: str) -> Optional[date]:
+    """
+    Atomically claim one send from today's quota for an account
+
+    The ledger row is created if missing, then incremented only while it is under the limit,
+    so concurrent workers can never push an account past its quota. Commits.
+    Returns the day the send was charged to (give it back to release_send), or None if the
+    quota is used up.
+    """
+    account_email = _normalize(account_email)
+    today = utc_today()
+    table = SendQuota.__table__
+
+    await db.execute(build_upsert(
+        db.get_bind().dialect.name,
+        table,
+        [{'account_email': account_email, 'day': today, 'sent_count': 0, 'updated_at': datetime.utcnow()}],
+        index_elements=['account_email', 'day']
+    ))
+    result = await db.execute(
+        table.update()
+        .where(
+            table.c.account_email == account_email,
+            table.c.day == today,
+            table.c.sent_count < _limit_expression(account_email)
+        )
+        .values(sent_count=table.c.sent_count + 1, updated_at=datetime.utcnow())
+    )
+    await db.commit()
+    return today if result.rowcount == 1 else None
+
+async def release_send(db, account_email: str, day: Optional[date] = None):
+    """
+    Give back a reserved send that didn't go out (the send failed)
+    Pass the day reserve_send returned, so a send that straddles midnight is released on its own day
+    """
+    table = SendQuota.__table__
+    await db.execute(
+        table.update()
+        .where(
+            table.c.account_email == _normalize(account_email),
+            table.c.day == (day or utc_today()),
+            table.c.sent_count > 0
+        )
+        .values(sent_count=table.c.sent_count - 1, updated_at=datetime.utcnow())
+    )
+    await db.commit()
+
+async def get_quota_usage(db, account_emails: List[str]) -> Dict[str, dict]:
+    """
+    Today's sent count, limit and remaining capacity per account
+    Two indexed lookups regardless of how much history the ledger holds
+    """
+    emails = list(dict.fromkeys(_normalize(email) for email in account_emails))
+    if not emails:
+        return {}
+
+    sent = dict((await db.execute(
+        select(SendQuota.account_email, SendQuota.sent_count).where(
+            SendQuota.account_email.in_(emails),
+            SendQuota.day == utc_today()
+        )
+    )).all())
+    limits = dict((await db.execute(
+        select(SendQuotaOverride.account_email, SendQuotaOverride.daily_limit).where(
+            SendQuotaOverride.account_email.in_(emails)
+        )
+    )).all())
+
+    usage = {}
+    for email in emails:
+        limit = limits.get(email, DAILY_EMAIL_LIMIT)
+        sent_today = sent.get(email, 0)
+        usage[email] = {
+            "daily_limit": limit,
+            "sent_today": sent_today,
+            "remaining": max(0, limit - sent_today),
+            "overridden": email in limits
+        }
+    return usage
+
+async def owns_sender_account(db, user, account_email: str) -> bool:
+    """A user's sending accounts: their login address and the sender of any of their campaigns"""
+    account_email = _normalize(account_email)
+    if _normalize(user.email) == account_email:
+        return True
+    campaign_id = await db.scalar(
+        select(Campaign.id).where(
+            Campaign.user_id == user.id,
+            func.lower(Campaign.sender_email) == account_email
+        ).limit(1)
+    )
+    return campaign_id is not None
+
+async def set_daily_limit(db, account_email: str, daily_limit: Optional[int]):
+    """Override an account's daily limit; None restores the default"""
+    account_email = _normalize(account_email)
+    if daily_limit is None:
+        await db.execute(delete(SendQuotaOverride).where(SendQuotaOverride.account_email == account_email))
+    else:
+        table = SendQuotaOverride.__table__
+        await db.execute(build_upsert(
+            db.get_bind().dialect.name,
+            table,
+            [{'account_email': account_email, 'daily_limit': daily_limit, 'updated_at': datetime.utcnow()}],
+            index_elements=['account_email'],
+            update=lambda excluded: {
+                'daily_limit': excluded.daily_limit,
+                'updated_at': excluded.updated_at
+            }
+        ))
+    await db.commit()
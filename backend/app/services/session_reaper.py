@@ -0,0 +1,16 @@
+import os
+
+from app.models import Session as UserSession
+from app.services.reaper import reap_expired_rows, run_reaper
+
+# How often to sweep and how many rows to delete per transaction
+SESSION_REAPER_INTERVAL = int(os.getenv("SESSION_REAPER_INTERVAL", "3600"))
+SESSION_REAPER_BATCH_SIZE = int(os.getenv("SESSION_REAPER_BATCH_SIZE", "500"))
+
+def reap_expired_sessions(batch_size: int = SESSION_REAPER_BATCH_SIZE) -> int:
+    """Delete expired sessions in batches; returns the number of deleted rows"""
+    return reap_expired_rows(UserSession, UserSession.expires_at, batch_size)
+
+async def run_session_reaper(interval: int = SESSION_REAPER_INTERVAL):
+    """Background loop that periodically removes expired sessions"""
+    await run_reaper("Session reaper", "expired sessions", reap_expired_sessions, interval)
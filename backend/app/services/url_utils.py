@@ -0,0 +1,56 @@
+from typing import Optional
+from urllib.parse import urlparse
+
+import tldextract
+
+# Public Suffix List snapshot bundled with tldextract - never fetched or cached at runtime.
+# Private suffixes count too, so every wixsite.com / github.io site is its own domain
+_public_suffixes = tldextract.TLDExtract(suffix_list_urls=(), cache_dir=None, include_psl_private_domains=True)
+
+def host_of(url: str) -> Optional[str]:
+    """Lowercase host of a URL (a bare host is accepted too)"""
+    if "//" not in url:
+        url = f"//{url}"
+    try:
+        host = urlparse(url).hostname
+    except ValueError:
+        return None
+    return host.rstrip(".") if host else None
+
+def registrable_domain(url: str) -> Optional[str]:
+    """
+    The domain a business actually registered: shop.example.co.uk -> example.co.uk
+    IP addresses, single-label hosts and hosts under an unknown suffix are returned as they are
+    """
+    host = host_of(url)
+    if not host:
+        return None
+    parts = _public_suffixes(host)
+    if not parts.domain or not parts.suffix:
+        # Unknown suffix - the whole host is the safest bucket
+        return host
+    return f"{parts.domain}.{parts.suffix}"
+
+def normalize_url(url: str) -> Optional[str]:
+    """
+    Canonical form of a page URL for deduplication: lowercase scheme, host and path, no default
+    port, fragment, trailing slash or utm_* parameters. Non-http(s) URLs give None.
+    """
+    try:
+        parts = urlparse(url.strip())
+        host = parts.hostname
+        port = parts.port
+    except ValueError:
+        return None
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https") or not host:
+        return None
+
+    netloc = host.rstrip(".")
+    if port and port != {"http": 80, "https": 443}[scheme]:
+        netloc = f"{netloc}:{port}"
+    path = parts.path.lower().rstrip("/") or "/"
+    query = "&".join(sorted(
+        param for param in parts.query.split("&") if param and not param.lower().startswith("utm_")
+    ))
+    return f"{scheme}://{netloc}{path}" + (f"?{query}" if query else "")
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Compare the single-pass lxml extractor with the previous BeautifulSoup extraction
+
+The corpus is every *.html / *.htm file in a directory of saved pages; without one,
+a synthetic corpus of small, medium and large business pages is generated.
+It also measures parse throughput on the process pool (SCRAPER_PARSE_WORKERS) per worker count.
+
+Usage: python benchmarks/html_extract_benchmark.py [html_dir] [rounds]
+"""
+
+import multiprocessing
+import os
+import random
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from app.services.html_extract import EMAIL_PATTERN, CONTACT_KEYWORDS, extract_page  # noqa: E402
+
+def extract_with_bs4(content: bytes):
+    """The extraction EmailScraper did before: a full soup plus regex over the raw text"""
+    text = content.decode("utf-8", errors="replace")
+    soup = BeautifulSoup(text, "html.parser")
+    emails = EMAIL_PATTERN.findall(text)
+    for link in soup.find_all("a", href=re.compile(r"^mailto:")):
+        emails.append(link["href"].replace("mailto:", "").split("?")[0])
+
+    links = []
+    for link in soup.find_all("a", href=True):
+        href = link.get("href", "").lower()
+        link_text = link.get_text("", strip=True).lower()
+        if any(keyword in href or keyword in link_text for keyword in CONTACT_KEYWORDS):
+            if not href.startswith("http") and not href.startswith("#"):
+                links.append(link.get("href"))
+    return {"emails": emails, "links": links}
+
+def extract_with_lxml(content: bytes):
+    result = extract_page(content)
+    # The old extraction dropped absolute links outright
+    links = [link["href"] for link in result["links"] if not link["href"].lower().startswith("http")]
+    return {"emails": result["emails"], "links": links}
+
+def synthetic_page(rng: random.Random, sections: int) -> bytes:
+    words = ["quality", "service", "local", "family", "owned", "since", "best", "prices", "open", "daily"]
+    parts = ["<!DOCTYPE html><html><head><title>Business</title>",
+             "<style>body{font-family:sans-serif}</style><script>var cfg={a:1,b:[1,2,3]};</script></head><body>",
+             '<nav><a href="/">Home</a><a href="/about-us">About us</a><a href="/services">Services</a>',
+             '<a href="/Contact">Get in touch</a><a href="https://facebook.com/biz">Facebook</a></nav>']
+    for i in range(sections):
+        text = " ".join(rng.choice(words) for _ in range(60))
+        parts.append(f'<section class="s{i}"><h2>Section {i}</h2><p>{text}</p>'
+                     f'<ul>{"".join(f"<li><a href=/item/{i}/{j}>Item {j}</a></li>" for j in range(8))}</ul></section>')
+        if i % 25 == 0:
+            parts.append(f'<p>Questions? Write to sales{i}@business-example.org</p>')
+    parts.append('<footer><a href="mailto:info@business-example.org?subject=Hi">Email us</a>'
+                 '<!-- built by web@agency-example.net --><a href="/team">Our team</a></footer></body></html>')
+    return "".join(parts).encode("utf-8")
+
+def load_corpus(html_dir):
+    if html_dir:
+        pages = []
+        for name in sorted(os.listdir(html_dir)):
+            if name.lower().endswith((".html", ".htm")):
+                with open(os.path.join(html_dir, name), "rb") as f:
+                    pages.append(f.read())
+        return pages
+    rng = random.Random(42)
+    return [synthetic_page(rng, sections) for sections in [5] * 20 + [50] * 10 + [400] * 4]
+
+def run(extract, pages, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for page in pages:
+            extract(page)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def run_pool(pages, workers: int, rounds: int) -> float:
+    """Parse the corpus on a process pool the way extract_page_async does"""
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        list(pool.map(extract_page, pages[:workers]))  # start the workers outside the timing
+        best = float("inf")
+        for _ in range(rounds):
+            started = time.perf_counter()
+            list(pool.map(extract_page, pages, chunksize=2))
+            best = min(best, time.perf_counter() - started)
+    return best
+
+def main():
+    html_dir = sys.argv[1] if len(sys.argv) > 1 and os.path.isdir(sys.argv[1]) else os.getenv("BENCH_HTML_DIR")
+    rounds = int(sys.argv[-1]) if len(sys.argv) > 1 and sys.argv[-1].isdigit() else 3
+    pages = load_corpus(html_dir)
+    if not pages:
+        print(f"No .html files found in {html_dir}")
+        return
+
+    total_mb = sum(len(page) for page in pages) / 1e6
+    print(f"Corpus: {len(pages)} pages, {total_mb:.1f} MB ({html_dir or 'synthetic'}), best of {rounds} rounds")
+
+    mismatches = 0
+    for page in pages:
+        old, new = extract_with_bs4(page), extract_with_lxml(page)
+        if set(e.lower() for e in old["emails"]) != set(e.lower() for e in new["emails"]) or old["links"] != new["links"]:
+            mismatches += 1
+    print(f"Pages where results differ: {mismatches}")
+
+    bs4_seconds = run(extract_with_bs4, pages, rounds)
+    lxml_seconds = run(extract_with_lxml, pages, rounds)
+    for label, seconds in [("BeautifulSoup (html.parser)", bs4_seconds), ("lxml single pass", lxml_seconds)]:
+        print(f"{label:30s} {seconds * 1000:9.1f} ms  {len(pages) / seconds:8.1f} pages/s  {total_mb / seconds:7.2f} MB/s")
+    print(f"Speedup: {bs4_seconds / lxml_seconds:.1f}x")
+
+    cpus = os.cpu_count() or 1
+    print(f"\nProcess pool ({cpus} CPUs available)")
+    for workers in sorted({1, 2, 4, cpus}):
+        if workers > cpus:
+            continue
+        seconds = run_pool(pages, workers, rounds)
+        print(f"{workers:2d} worker(s)  {seconds * 1000:9.1f} ms  {len(pages) / seconds:8.1f} pages/s  "
+              f"{lxml_seconds / seconds:5.2f}x inline")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Measure API cold-start time: importing app.main and running the lifespan startup
+Each sample runs in a fresh interpreter, like a new uvicorn worker
+
+Usage: python benchmarks/startup_benchmark.py [runs]
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs inside the child interpreter
+PROBE = """
+import asyncio, json, sys, time
+started = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+
+async def run_lifespan():
+    async with app.router.lifespan_context(app):
+        pass
+
+asyncio.run(run_lifespan())
+finished = time.perf_counter()
+
+heavy = ["googleapiclient", "google_auth_oauthlib", "openai", "bs4", "passlib"]
+print(json.dumps({
+    "import": imported - started,
+    "lifespan": finished - imported,
+    "heavy_modules_loaded": [name for name in heavy if name in sys.modules]
+}))
+"""
+
+def run_once(workdir: str) -> dict:
+    env = dict(os.environ, PYTHONPATH=BACKEND_DIR)
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=workdir, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    # Use a scratch directory so the benchmark never touches the real database
+    with tempfile.TemporaryDirectory() as workdir:
+        run_once(workdir)  # Warm the filesystem cache and create the schema
+        samples = [run_once(workdir) for _ in range(runs)]
+
+    imports = [s["import"] for s in samples]
+    lifespans = [s["lifespan"] for s in samples]
+
+    print(f"Runs: {runs}")
+    print(f"Import app.main:   median {statistics.median(imports) * 1000:.0f} ms, min {min(imports) * 1000:.0f} ms")
+    print(f"Lifespan startup:  median {statistics.median(lifespans) * 1000:.0f} ms, min {min(lifespans) * 1000:.0f} ms")
+    print(f"Heavy modules loaded at startup: {samples[-1]['heavy_modules_loaded'] or 'none'}")
+
+if __name__ == "__main__":
+    main()